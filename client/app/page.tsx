@@ -3,6 +3,8 @@
 import { useState, useEffect } from "react"
 import type { Book } from "@/lib/types"
 import { getBooks, deleteBook } from "@/lib/storage"
+import { getToken, logout, UNAUTHORIZED_EVENT } from "@/lib/auth"
+import { LoginForm } from "@/components/login-form"
 import { BookCard } from "@/components/book-card"
 import { AddBookDialog } from "@/components/add-book-dialog"
 import { EditBookDialog } from "@/components/edit-book-dialog"
@@ -28,7 +30,9 @@ export default function HomePage() {
   const [editingBook, setEditingBook] = useState<Book | null>(null)
   const [deleteBookDialog, setDeleteBookDialog] = useState<string | null>(null)
   const [activeTab, setActiveTab] = useState<"books" | "coming-soon">("books")
+  const [signedIn, setSignedIn] = useState(true)
   const { toast } = useToast()
+  const apiUrl = process.env.NEXT_PUBLIC_API_URL
 
   const CACHE_DURATION = 5 * 60 * 1000 // 5 minutes
   const loadBooks = async () => {
@@ -46,6 +50,34 @@ export default function HomePage() {
     loadBooks()
   }, [])
 
+  // Without a backend the library lives in localStorage and needs no account.
+  useEffect(() => {
+    if (!apiUrl) return
+    setSignedIn(!!getToken())
+    const handleUnauthorized = () => {
+      setSignedIn(false)
+      setSelectedBook(null)
+      setBooksCache(null)
+    }
+    window.addEventListener(UNAUTHORIZED_EVENT, handleUnauthorized)
+    return () => window.removeEventListener(UNAUTHORIZED_EVENT, handleUnauthorized)
+  }, [])
+
+  const handleSignedIn = async () => {
+    setSignedIn(true)
+    const books = await getBooks()
+    setBooks(books)
+    setBooksCache({ books, timestamp: Date.now() })
+  }
+
+  const handleSignOut = async () => {
+    await logout()
+    setSignedIn(false)
+    setSelectedBook(null)
+    setBooks([])
+    setBooksCache(null)
+  }
+
   const handleViewBook = (book: Book) => {
     setSelectedBook(book)
   }
@@ -69,6 +101,10 @@ export default function HomePage() {
     loadBooks()
   }
 
+  if (apiUrl && !signedIn) {
+    return <LoginForm onSignedIn={handleSignedIn} />
+  }
+
   if (selectedBook) {
     // Use books from state, which is loaded asynchronously
     const currentBook = books.find((b) => b.id === selectedBook.id)
@@ -99,6 +135,11 @@ export default function HomePage() {
               <Button variant="ghost" disabled className="font-medium text-muted-foreground/50 cursor-not-allowed">
                 Coming Soon
               </Button>
+              {apiUrl && (
+                <Button variant="ghost" onClick={handleSignOut} className="font-medium">
+                  Sign out
+                </Button>
+              )}
             </nav>
           </div>
         </div>
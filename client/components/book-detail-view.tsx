@@ -23,6 +23,7 @@ import {
   AlertDialogHeader,
   AlertDialogTitle,
 } from "@/components/ui/alert-dialog"
+import { apiFetch } from "@/lib/auth"
 import Image from "next/image"
 
 interface BookDetailViewProps {
@@ -39,7 +40,7 @@ export function BookDetailView({ book, onBack, onUpdate }: BookDetailViewProps)
     const apiUrl = process.env.NEXT_PUBLIC_API_URL
     if (apiUrl) {
       try {
-        const res = await fetch(`${apiUrl}/books/chapter/${chapterId}/notes/`)
+        const res = await apiFetch(`${apiUrl}/books/chapter/${chapterId}/notes/`)
         if (res.ok) {
           const data = await res.json()
           // Convert timestamp to Date
@@ -84,7 +85,7 @@ export function BookDetailView({ book, onBack, onUpdate }: BookDetailViewProps)
     const apiUrl = process.env.NEXT_PUBLIC_API_URL
     if (apiUrl) {
       try {
-        const res = await fetch(`${apiUrl}/books/${book.id}/chapters/`)
+        const res = await apiFetch(`${apiUrl}/books/${book.id}/chapters/`)
         if (res.ok) {
           const data = await res.json()
           // Ensure notes is always an array
@@ -0,0 +1,97 @@
+"use client"
+
+import type React from "react"
+
+import { useState } from "react"
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
+import { Button } from "@/components/ui/button"
+import { Input } from "@/components/ui/input"
+import { Label } from "@/components/ui/label"
+import { BookOpen } from "lucide-react"
+import { login, register } from "@/lib/auth"
+
+interface LoginFormProps {
+  onSignedIn: () => void
+}
+
+export function LoginForm({ onSignedIn }: LoginFormProps) {
+  const [mode, setMode] = useState<"login" | "register">("login")
+  const [username, setUsername] = useState("")
+  const [password, setPassword] = useState("")
+  const [error, setError] = useState<string | null>(null)
+  const [submitting, setSubmitting] = useState(false)
+
+  const handleSubmit = async (e: React.FormEvent) => {
+    e.preventDefault()
+    setError(null)
+    setSubmitting(true)
+    try {
+      if (mode === "login") {
+        await login(username, password)
+      } else {
+        await register(username, password)
+      }
+      onSignedIn()
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Something went wrong")
+    } finally {
+      setSubmitting(false)
+    }
+  }
+
+  return (
+    <div className="flex min-h-screen items-center justify-center bg-gradient-to-b from-amber-50/50 to-orange-50/30 px-4 dark:from-amber-950/10 dark:to-orange-950/5">
+      <Card className="w-full max-w-sm">
+        <CardHeader>
+          <div className="flex items-center gap-3">
+            <BookOpen className="h-8 w-8 text-amber-600 dark:text-amber-400" />
+            <CardTitle className="text-xl">Our Reading Nook</CardTitle>
+          </div>
+          <CardDescription>
+            {mode === "login" ? "Sign in to see your library." : "Create an account to start your library."}
+          </CardDescription>
+        </CardHeader>
+        <CardContent>
+          <form onSubmit={handleSubmit} className="space-y-4">
+            <div className="space-y-2">
+              <Label htmlFor="username">Username</Label>
+              <Input
+                id="username"
+                autoComplete="username"
+                value={username}
+                onChange={(e) => setUsername(e.target.value)}
+                required
+              />
+            </div>
+            <div className="space-y-2">
+              <Label htmlFor="password">Password</Label>
+              <Input
+                id="password"
+                type="password"
+                autoComplete={mode === "login" ? "current-password" : "new-password"}
+                value={password}
+                onChange={(e) => setPassword(e.target.value)}
+                required
+              />
+            </div>
+            {error && <p className="text-sm text-destructive">{error}</p>}
+            <Button type="submit" className="w-full" disabled={submitting}>
+              {mode === "login" ? "Sign in" : "Create account"}
+            </Button>
+            <Button
+              type="button"
+              variant="ghost"
+              className="w-full"
+              onClick={() => {
+                setMode(mode === "login" ? "register" : "login")
+                setError(null)
+              }}
+            >
+              {mode === "login" ? "New here? Create an account" : "Already have an account? Sign in"}
+            </Button>
+          </form>
+        </CardContent>
+      </Card>
+    </div>
+  )
+}
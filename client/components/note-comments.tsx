@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from "react"
 import type { ChapterNote } from "@/lib/types"
 import { Button } from "@/components/ui/button"
+import { apiFetch } from "@/lib/auth"
 
 interface NoteComment {
   id: string
@@ -25,7 +26,7 @@ export function NoteComments({ noteId }: NoteCommentsProps) {
     if (!apiUrl) return
     setLoading(true)
     try {
-      const res = await fetch(`${apiUrl}/books/note/${noteId}/comments/`)
+      const res = await apiFetch(`${apiUrl}/books/note/${noteId}/comments/`)
       if (res.ok) {
         const data = await res.json()
         setComments(data)
@@ -44,7 +45,7 @@ export function NoteComments({ noteId }: NoteCommentsProps) {
     if (!apiUrl || !newComment || !author) return
     setLoading(true)
     try {
-      const res = await fetch(`${apiUrl}/books/note/${noteId}/add-comment/`, {
+      const res = await apiFetch(`${apiUrl}/books/note/${noteId}/add-comment/`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ content: newComment, author }),
@@ -63,7 +64,7 @@ export function NoteComments({ noteId }: NoteCommentsProps) {
     if (!apiUrl) return
     setLoading(true)
     try {
-      await fetch(`${apiUrl}/books/comment/${commentId}/delete/`, { method: "DELETE" })
+      await apiFetch(`${apiUrl}/books/comment/${commentId}/delete/`, { method: "DELETE" })
       fetchComments()
     } finally {
       setLoading(false)
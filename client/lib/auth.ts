@@ -0,0 +1,60 @@
+"use client"
+
+const TOKEN_KEY = "books-auth-token"
+export const UNAUTHORIZED_EVENT = "books-unauthorized"
+
+export function getToken(): string | null {
+  if (typeof window === "undefined") return null
+  return localStorage.getItem(TOKEN_KEY)
+}
+
+function setToken(token: string): void {
+  localStorage.setItem(TOKEN_KEY, token)
+}
+
+function clearToken(): void {
+  localStorage.removeItem(TOKEN_KEY)
+}
+
+// fetch for the books API: sends the user's token and signs them out when the API rejects it.
+export async function apiFetch(input: string, init: RequestInit = {}): Promise<Response> {
+  const headers = new Headers(init.headers)
+  const token = getToken()
+  if (token) headers.set("Authorization", `Token ${token}`)
+  const res = await fetch(input, { ...init, headers })
+  if (res.status === 401) {
+    clearToken()
+    window.dispatchEvent(new Event(UNAUTHORIZED_EVENT))
+  }
+  return res
+}
+
+async function authenticate(action: "login" | "register", username: string, password: string): Promise<void> {
+  const apiUrl = process.env.NEXT_PUBLIC_API_URL
+  const res = await fetch(`${apiUrl}/books/auth/${action}/`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ username, password }),
+  })
+  const data = await res.json()
+  if (!res.ok) throw new Error(data.error || "Authentication failed")
+  setToken(data.token)
+}
+
+export function login(username: string, password: string): Promise<void> {
+  return authenticate("login", username, password)
+}
+
+export function register(username: string, password: string): Promise<void> {
+  return authenticate("register", username, password)
+}
+
+export async function logout(): Promise<void> {
+  const apiUrl = process.env.NEXT_PUBLIC_API_URL
+  try {
+    await apiFetch(`${apiUrl}/books/auth/logout/`, { method: "POST" })
+  } catch {
+    // the token is dropped locally either way
+  }
+  clearToken()
+}
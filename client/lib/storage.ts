@@ -1,6 +1,7 @@
 "use client"
 
 import type { Book, Chapter, ChapterNote } from "./types"
+import { apiFetch } from "./auth"
 
 const STORAGE_KEY = "books-notes-data"
 
@@ -8,7 +9,7 @@ export async function getBooks(): Promise<Book[]> {
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      const res = await fetch(`${apiUrl}/books/list/`)
+      const res = await apiFetch(`${apiUrl}/books/list/`)
       if (res.ok) {
         const books = await res.json()
         return books.map((book: any) => ({
@@ -48,7 +49,7 @@ export function addBook(book: Omit<Book, "id" | "createdAt" | "chapters">): Book
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     // Send to backend
-    return fetch(`${apiUrl}/books/add/`, {
+    return apiFetch(`${apiUrl}/books/add/`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -97,7 +98,7 @@ export async function updateBook(id: string, updates: Partial<Book>): Promise<vo
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      await fetch(`${apiUrl}/books/${id}/update/`, {
+      await apiFetch(`${apiUrl}/books/${id}/update/`, {
         method: "PATCH",
         headers: {
           "Content-Type": "application/json",
@@ -121,7 +122,7 @@ export async function deleteBook(id: string): Promise<void> {
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      const res = await fetch(`${apiUrl}/books/${id}/delete/`, {
+      const res = await apiFetch(`${apiUrl}/books/${id}/delete/`, {
         method: "DELETE",
       })
       if (!res.ok) throw new Error("Failed to delete book")
@@ -139,7 +140,7 @@ export async function addChapter(bookId: string, chapter: Omit<Chapter, "id" | "
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      const res = await fetch(`${apiUrl}/books/${bookId}/add-chapter/`, {
+      const res = await apiFetch(`${apiUrl}/books/${bookId}/add-chapter/`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -182,7 +183,7 @@ export async function updateChapter(bookId: string, chapterId: string, updates:
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      await fetch(`${apiUrl}/books/chapter/${chapterId}/update/`, {
+      await apiFetch(`${apiUrl}/books/chapter/${chapterId}/update/`, {
         method: "PATCH",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(updates),
@@ -208,7 +209,7 @@ export async function deleteChapter(bookId: string, chapterId: string): Promise<
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      const res = await fetch(`${apiUrl}/books/chapter/${chapterId}/delete/`, {
+      const res = await apiFetch(`${apiUrl}/books/chapter/${chapterId}/delete/`, {
         method: "DELETE",
       })
       if (!res.ok) throw new Error("Failed to delete chapter")
@@ -230,7 +231,7 @@ export async function addChapterNote(bookId: string, chapterId: string, note: Om
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      await fetch(`${apiUrl}/books/chapter/${chapterId}/add-note/`, {
+      await apiFetch(`${apiUrl}/books/chapter/${chapterId}/add-note/`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -268,7 +269,7 @@ export async function updateChapterNote(
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      await fetch(`${apiUrl}/books/note/${noteId}/update/`, {
+      await apiFetch(`${apiUrl}/books/note/${noteId}/update/`, {
         method: "PATCH",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(updates),
@@ -297,7 +298,7 @@ export async function deleteChapterNote(bookId: string, chapterId: string, noteI
   const apiUrl = process.env.NEXT_PUBLIC_API_URL
   if (apiUrl) {
     try {
-      const res = await fetch(`${apiUrl}/books/note/${noteId}/delete/`, {
+      const res = await apiFetch(`${apiUrl}/books/note/${noteId}/delete/`, {
         method: "DELETE",
       })
       if (!res.ok) throw new Error("Failed to delete note")
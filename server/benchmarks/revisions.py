@@ -0,0 +1,152 @@
+"""
+Storage overhead of note revision history on simulated autosave edit streams.
+
+Compares three ways of keeping every saved version of a note:
+  * raw full copies (what storing the text on each save would cost);
+  * zlib-compressed full copies, the fair baseline for the delta scheme;
+  * the encoding in books/revisions.py: compressed line and word deltas with
+    a full snapshot every SNAPSHOT_INTERVAL revisions.
+It also checks that every revision rebuilds to the original text.
+
+Edit streams are built from real English prose, one paragraph per line as
+typed in the app. The paragraph stream is a note made of a single growing
+paragraph, which is how most chapter notes are written. By default the prose
+paragraphs of the Python reference documentation bundled with the interpreter
+are used; pass --corpus with any plain-text file (e.g. a Project Gutenberg
+book) to use that instead.
+
+Run from the ``server`` directory:
+
+    python benchmarks/revisions.py [--saves N] [--seed S] [--corpus PATH]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from books.revisions import (  # noqa: E402
+    SNAPSHOT_INTERVAL, apply_delta, decode_delta, decode_snapshot, encode_delta, encode_snapshot,
+)
+
+
+def load_paragraphs(corpus=None):
+    """Prose paragraphs of at least 200 characters, each joined onto one line."""
+    if corpus:
+        text = Path(corpus).read_text(encoding='utf-8', errors='replace')
+    else:
+        from pydoc_data.topics import topics
+        text = '\n\n'.join(topics.values())
+    paragraphs = []
+    for block in re.split(r'\n\s*\n', text):
+        lines = block.splitlines()
+        # Skip code samples, tables and headings; keep wrapped prose.
+        if any(line.startswith(('     ', '>>>', '+', '=', '-')) for line in lines):
+            continue
+        paragraph = ' '.join(line.strip() for line in lines)
+        if len(paragraph) >= 200 and paragraph.count('. ') >= 1:
+            paragraphs.append(paragraph)
+    if len(paragraphs) < 50:
+        raise SystemExit('Corpus has too little prose')
+    return paragraphs
+
+
+def typing_stream(rng, paragraphs, saves):
+    """Autosave while writing: each save adds the next few words of a paragraph."""
+    source = rng.sample(paragraphs, len(paragraphs))
+    done = []
+    words = source.pop().split()
+    typed = 0
+    for _ in range(saves):
+        typed += rng.randint(3, 12)
+        if typed >= len(words):
+            done.append(' '.join(words))
+            words = source.pop().split()
+            typed = rng.randint(1, 5)
+        yield '\n'.join(done + [' '.join(words[:typed])])
+
+
+def paragraph_stream(rng, paragraphs, saves):
+    """A single-paragraph chapter note: autosave while typing it, fixing the odd word."""
+    source = ' '.join(rng.sample(paragraphs, len(paragraphs))).split()
+    words = []
+    for _ in range(saves):
+        if len(words) > 10 and rng.random() < 0.2:
+            words[rng.randrange(len(words))] = rng.choice(source)
+        else:
+            words.extend(source[len(words):len(words) + rng.randint(3, 12)])
+        yield ' '.join(words)
+
+
+def revising_stream(rng, paragraphs, saves, size=40):
+    """Editing a long note: fix a word, rewrite, insert or delete a paragraph."""
+    lines = rng.sample(paragraphs, size)
+    for _ in range(saves):
+        i = rng.randrange(len(lines))
+        choice = rng.random()
+        if choice < 0.5:
+            words = lines[i].split()
+            j = rng.randrange(len(words))
+            words[j] = rng.choice(rng.choice(paragraphs).split())
+            lines[i] = ' '.join(words)
+        elif choice < 0.75:
+            lines[i] = rng.choice(paragraphs)
+        elif choice < 0.9 or len(lines) < 5:
+            lines.insert(i, rng.choice(paragraphs))
+        else:
+            del lines[i]
+        yield '\n'.join(lines)
+
+
+def measure(name, versions):
+    raw = 0
+    compressed = 0
+    stored = []
+    previous = None
+    for number, text in enumerate(versions, start=1):
+        raw += len(text.encode())
+        compressed += len(zlib.compress(text.encode()))
+        if previous is None or number % SNAPSHOT_INTERVAL == 0:
+            stored.append((True, encode_snapshot(text)))
+        else:
+            stored.append((False, encode_delta(previous, text)))
+        previous = text
+
+    start = time.perf_counter()
+    text = None
+    for (is_snapshot, data), expected in zip(stored, versions):
+        text = decode_snapshot(data) if is_snapshot else apply_delta(text, decode_delta(data))
+        assert text == expected, 'revision did not rebuild correctly'
+    replay = time.perf_counter() - start
+
+    delta = sum(len(data) for _, data in stored)
+    print(
+        f'{name:<10} {len(versions):>6} {raw / 1024:>10.1f} {compressed / 1024:>10.1f} {delta / 1024:>10.1f} '
+        f'{delta / compressed:>10.1%} {replay / len(versions) * 1e6:>11.1f}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saves', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus', help='Plain-text file to draw prose paragraphs from.')
+    args = parser.parse_args()
+
+    paragraphs = load_paragraphs(args.corpus)
+    print(
+        f"{'stream':<10} {'saves':>6} {'raw (KiB)':>10} {'zlib (KiB)':>10} {'delta (KiB)':>10} "
+        f"{'vs zlib':>10} {'apply (us)':>11}"
+    )
+    measure('typing', list(typing_stream(random.Random(args.seed), paragraphs, args.saves)))
+    measure('paragraph', list(paragraph_stream(random.Random(args.seed), paragraphs, args.saves)))
+    measure('revising', list(revising_stream(random.Random(args.seed), paragraphs, args.saves)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Startup benchmark comparing the development and production settings profiles.
+
+For each profile it measures, in fresh interpreters:
+  * time-to-first-response: process start until the WSGI application has
+    answered a CORS preflight for /books/list/ (no database access needed);
+  * import time: the sum of self times reported by ``python -X importtime``
+    while loading the WSGI application and serving that request.
+
+Run from the ``server`` directory:
+
+    python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+PROFILES = ['development', 'production']
+
+
+def serve_first_request():
+    """Load the WSGI application and answer a single request."""
+    from io import BytesIO
+    from server.wsgi import application
+
+    environ = {
+        'REQUEST_METHOD': 'OPTIONS',
+        'PATH_INFO': '/books/list/',
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+    }
+    status = []
+    body = b''.join(application(environ, lambda s, headers, exc_info=None: status.append(s)))
+    if not status or not status[0].startswith('200'):
+        raise SystemExit(f'Unexpected response: {status} {body!r}')
+
+
+def run_child(profile, importtime=False):
+    env = dict(os.environ, DJANGO_PROFILE=profile, DJANGO_SETTINGS_MODULE='server.settings')
+    # The production profile refuses to start without its own secret key.
+    env.setdefault('DJANGO_SECRET_KEY', 'startup-benchmark')
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += [__file__, '--child']
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=SERVER_DIR, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f'{profile} run failed:\n{result.stderr}')
+    return elapsed, result.stderr
+
+
+def total_import_time(stderr):
+    """Sum the self-time column (microseconds) of ``-X importtime`` output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        total += int(line.split(':', 1)[1].split('|')[0])
+    return total / 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(SERVER_DIR))
+        serve_first_request()
+        return
+
+    print(f"{'profile':<12} {'first response (ms)':>20} {'import time (ms)':>18}")
+    for profile in PROFILES:
+        first_response = [run_child(profile)[0] for _ in range(args.runs)]
+        import_time = [total_import_time(run_child(profile, importtime=True)[1]) for _ in range(args.runs)]
+        print(
+            f'{profile:<12} '
+            f'{statistics.median(first_response) * 1000:>20.1f} '
+            f'{statistics.median(import_time) * 1000:>18.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
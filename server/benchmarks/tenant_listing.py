@@ -0,0 +1,86 @@
+"""
+List latency for one user as the total number of tenants grows.
+
+Fills a throwaway SQLite database with an increasing number of users that
+each own the same number of books, and times GET /books/list/ for a single
+user at every step. With books scoped by owner and the (owner, created_at)
+index, latency should stay flat instead of growing with the table.
+
+Run from the ``server`` directory:
+
+    python benchmarks/tenant_listing.py [--books-per-user N] [--requests N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
+
+TENANT_STEPS = [10, 100, 1000, 5000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books-per-user', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    db_dir = tempfile.TemporaryDirectory()
+    settings.DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(db_dir.name, 'bench.sqlite3'),
+    }
+    settings.ALLOWED_HOSTS = ['localhost']
+    settings.DEBUG = False
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test import Client
+    from books.auth import create_token
+    from books.models import Book
+
+    call_command('migrate', verbosity=0)
+    User = get_user_model()
+
+    print(f"{'tenants':>8} {'books':>9} {'median (ms)':>12} {'p95 (ms)':>10}")
+    tenants = 0
+    for step in TENANT_STEPS:
+        users = User.objects.bulk_create([User(username=f'user{i}') for i in range(tenants, step)])
+        Book.objects.bulk_create(
+            [
+                Book(owner=user, title=f'Book {n}', author=f'Author {n}')
+                for user in users
+                for n in range(args.books_per_user)
+            ],
+            batch_size=1000,
+        )
+        if tenants == 0:
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Token {create_token(users[0])}')
+        tenants = step
+
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = client.get('/books/list/')
+            timings.append(time.perf_counter() - start)
+            assert len(response.json()) == args.books_per_user
+        timings.sort()
+        print(
+            f'{tenants:>8} {Book.objects.count():>9} '
+            f'{statistics.median(timings) * 1000:>12.2f} '
+            f'{timings[int(len(timings) * 0.95)] * 1000:>10.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import base64
+import binascii
+from django.core.cache import cache
+from django.db.models import BigIntegerField, CharField, F, Q, Value
+from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
+from .models import Book, ChapterNote, NoteComment
+from .auth import api_login_required
+
+ACTIVITY_PAGE_SIZE = 20
+ACTIVITY_MAX_PAGE_SIZE = 100
+ACTIVITY_CACHE_TIMEOUT = 60
+
+
+def activity_cache_key(book_id):
+    return f'books:activity:{book_id}'
+
+
+def invalidate_activity_cache(book_id):
+    cache.delete(activity_cache_key(book_id))
+
+
+def _encode_cursor(row):
+    # The cursor is the sort key of the last item returned: "<iso timestamp>|<kind>|<id>".
+    key = f"{row['timestamp'].isoformat()}|{row['kind']}|{row['id']}"
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def _parse_cursor(cursor):
+    try:
+        key = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    timestamp, kind, item_id = key.rsplit('|', 2)
+    timestamp = parse_datetime(timestamp)
+    if timestamp is None or kind not in ('note', 'comment'):
+        raise ValueError('Invalid cursor')
+    return timestamp, kind, int(item_id)
+
+
+def _after_cursor(kind, cursor):
+    # Rows sort by (timestamp, kind, id) descending; keep only those strictly after the cursor.
+    timestamp, cursor_kind, cursor_id = cursor
+    older = Q(timestamp__lt=timestamp)
+    if kind < cursor_kind:
+        return older | Q(timestamp=timestamp)
+    if kind == cursor_kind:
+        return older | Q(timestamp=timestamp, id__lt=cursor_id)
+    return older
+
+
+def _activity_page(book_id, limit, cursor=None):
+    notes = ChapterNote.objects.filter(chapter__book_id=book_id)
+    comments = NoteComment.objects.filter(note__chapter__book_id=book_id)
+    if cursor is not None:
+        notes = notes.filter(_after_cursor('note', cursor))
+        comments = comments.filter(_after_cursor('comment', cursor))
+    notes = notes.annotate(
+        kind=Value('note', output_field=CharField()),
+        chapter_ref=F('chapter_id'),
+        note_ref=Value(None, output_field=BigIntegerField()),
+    ).values('id', 'content', 'author', 'timestamp', 'kind', 'chapter_ref', 'note_ref')
+    comments = comments.annotate(
+        kind=Value('comment', output_field=CharField()),
+        chapter_ref=F('note__chapter_id'),
+        note_ref=F('note_id'),
+    ).values('id', 'content', 'author', 'timestamp', 'kind', 'chapter_ref', 'note_ref')
+    # Fetch one extra row to know whether another page exists.
+    rows = list(notes.union(comments, all=True).order_by('-timestamp', '-kind', '-id')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'results': [
+            {
+                'id': str(row['id']),
+                'type': row['kind'],
+                'content': row['content'],
+                'author': row['author'],
+                'timestamp': row['timestamp'].isoformat(),
+                'chapterId': str(row['chapter_ref']),
+                'noteId': str(row['note_ref']) if row['note_ref'] is not None else None,
+            }
+            for row in rows
+        ],
+        'nextCursor': _encode_cursor(rows[-1]) if has_more else None,
+    }
+
+
+@api_login_required
+def list_activity(request, book_id):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'GET':
+        try:
+            limit = int(request.GET.get('limit', ACTIVITY_PAGE_SIZE))
+            cursor = request.GET.get('cursor')
+            cursor = _parse_cursor(cursor) if cursor else None
+        except ValueError:
+            return JsonResponse({'error': 'Invalid limit or cursor'}, status=400)
+        limit = max(1, min(limit, ACTIVITY_MAX_PAGE_SIZE))
+        # The cache key must use the integer id the signals invalidate, not the URL text ("05").
+        try:
+            book_id = int(book_id)
+        except ValueError:
+            return JsonResponse({'error': 'Book not found'}, status=404)
+        if not Book.objects.filter(id=book_id, owner=request.user).exists():
+            return JsonResponse({'error': 'Book not found'}, status=404)
+        # Only the default first page is cached; it is what the book view opens with.
+        cacheable = cursor is None and limit == ACTIVITY_PAGE_SIZE
+        if cacheable:
+            data = cache.get(activity_cache_key(book_id))
+            if data is not None:
+                return JsonResponse(data)
+        data = _activity_page(book_id, limit, cursor)
+        if cacheable:
+            cache.set(activity_cache_key(book_id), data, ACTIVITY_CACHE_TIMEOUT)
+        return JsonResponse(data)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
@@ -0,0 +1,49 @@
+import hashlib
+import secrets
+from functools import wraps
+from django.http import JsonResponse
+from .models import AuthToken
+
+AUTH_HEADER_PREFIX = 'Token '
+
+
+def _hash_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def create_token(user):
+    """Create a new API token for user and return its key; only the hash is stored."""
+    key = secrets.token_urlsafe(32)
+    AuthToken.objects.create(user=user, key_hash=_hash_key(key))
+    return key
+
+
+def token_for_request(request):
+    header = request.headers.get('Authorization', '')
+    if not header.startswith(AUTH_HEADER_PREFIX):
+        return None
+    key = header[len(AUTH_HEADER_PREFIX):].strip()
+    return AuthToken.objects.select_related('user').filter(key_hash=_hash_key(key), user__is_active=True).first()
+
+
+def api_login_required(view):
+    """
+    Authenticate the request from its "Authorization: Token <key>" header and
+    answer 401 JSON when it is missing or invalid. Session cookies are ignored
+    on purpose: the API views are csrf_exempt, so cookie auth would let any
+    third-party page write on the user's behalf.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method == 'OPTIONS':
+            response = view(request, *args, **kwargs)
+            if 'Access-Control-Allow-Headers' in response:
+                response['Access-Control-Allow-Headers'] += ', Authorization'
+            return response
+        token = token_for_request(request)
+        if token is None:
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        request.user = token.user
+        request.auth_token = token
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,71 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+import json
+from .auth import api_login_required, create_token
+
+
+@csrf_exempt
+def register(request):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            username = data.get('username')
+            password = data.get('password')
+            if not username or not password:
+                return JsonResponse({'error': 'Missing username or password'}, status=400)
+            User = get_user_model()
+            if User.objects.filter(username=username).exists():
+                return JsonResponse({'error': 'Username already taken'}, status=400)
+            try:
+                validate_password(password, User(username=username))
+            except ValidationError as e:
+                return JsonResponse({'error': ' '.join(e.messages)}, status=400)
+            user = User.objects.create_user(username=username, password=password)
+            return JsonResponse({'id': user.id, 'username': user.username, 'token': create_token(user)}, status=201)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
+
+
+@csrf_exempt
+def login_user(request):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            user = authenticate(request, username=data.get('username'), password=data.get('password'))
+            if user is None:
+                return JsonResponse({'error': 'Invalid username or password'}, status=401)
+            return JsonResponse({'id': user.id, 'username': user.username, 'token': create_token(user)}, status=200)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
+
+
+@csrf_exempt
+@api_login_required
+def logout_user(request):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'POST':
+        request.auth_token.delete()
+        return JsonResponse({'success': True}, status=200)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
@@ -1,6 +1,8 @@
 from django.http import JsonResponse
 from .models import Book, Chapter
+from .auth import api_login_required
 
+@api_login_required
 def list_chapters(request, book_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -10,7 +12,7 @@ def list_chapters(request, book_id):
         return response
     if request.method == 'GET':
         try:
-            book = Book.objects.get(id=book_id)
+            book = Book.objects.get(id=book_id, owner=request.user)
             chapters = book.chapters.all().order_by('chapter_number')
             data = [
                 {
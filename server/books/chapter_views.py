@@ -2,8 +2,12 @@ from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 import json
 from .models import Book, Chapter
+from .idempotency import idempotent
+from .auth import api_login_required
 
 @csrf_exempt
+@api_login_required
+@idempotent
 def add_chapter(request, book_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -18,7 +22,7 @@ def add_chapter(request, book_id):
             chapter_number = data.get('chapterNumber')
             if not title or not chapter_number:
                 return JsonResponse({'error': 'Missing title or chapter number'}, status=400)
-            book = Book.objects.get(id=book_id)
+            book = Book.objects.get(id=book_id, owner=request.user)
             chapter = Chapter.objects.create(
                 book=book,
                 title=title,
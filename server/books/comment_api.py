@@ -2,8 +2,12 @@ from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 import json
 from .models import ChapterNote, NoteComment
+from .idempotency import idempotent
+from .auth import api_login_required
 
 @csrf_exempt
+@api_login_required
+@idempotent
 def add_comment(request, note_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -18,7 +22,7 @@ def add_comment(request, note_id):
             author = data.get('author')
             if not content or not author:
                 return JsonResponse({'error': 'Missing content or author'}, status=400)
-            note = ChapterNote.objects.get(id=note_id)
+            note = ChapterNote.objects.select_related('chapter').get(id=note_id, chapter__book__owner=request.user)
             comment = NoteComment.objects.create(
                 note=note,
                 content=content,
@@ -37,6 +41,7 @@ def add_comment(request, note_id):
     return JsonResponse({'error': 'Invalid method'}, status=405)
 
 @csrf_exempt
+@api_login_required
 def list_comments(request, note_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -46,7 +51,7 @@ def list_comments(request, note_id):
         return response
     if request.method == 'GET':
         try:
-            note = ChapterNote.objects.get(id=note_id)
+            note = ChapterNote.objects.get(id=note_id, chapter__book__owner=request.user)
             comments = note.comments.all().order_by('-timestamp')
             data = [
                 {
@@ -63,6 +68,7 @@ def list_comments(request, note_id):
     return JsonResponse({'error': 'Invalid method'}, status=405)
 
 @csrf_exempt
+@api_login_required
 def delete_comment(request, comment_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -72,7 +78,7 @@ def delete_comment(request, comment_id):
         return response
     if request.method == 'DELETE':
         try:
-            comment = NoteComment.objects.get(id=comment_id)
+            comment = NoteComment.objects.select_related('note__chapter').get(id=comment_id, note__chapter__book__owner=request.user)
             comment.delete()
             return JsonResponse({'success': True}, status=200)
         except NoteComment.DoesNotExist:
@@ -0,0 +1,75 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+def idempotent(view):
+    """
+    Make a POST/PATCH view safe to retry. When the request carries an
+    Idempotency-Key header, the key is claimed before the view runs and its
+    response is stored and replayed for retries of the same request by the
+    same user until the key expires, without running the view again. A retry
+    that arrives while the first request is still running gets a 409. Server
+    errors release the key so the request can be retried.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method == 'OPTIONS':
+            response = view(request, *args, **kwargs)
+            if 'Access-Control-Allow-Headers' in response:
+                response['Access-Control-Allow-Headers'] += f', {IDEMPOTENCY_HEADER}'
+            return response
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method not in ('POST', 'PATCH') or not key or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > 255:
+            return JsonResponse({'error': 'Idempotency-Key too long'}, status=400)
+        request_hash = hashlib.sha256(request.body).hexdigest()
+        lookup = {'user': request.user, 'key': key, 'method': request.method, 'path': request.path}
+        try:
+            with transaction.atomic():
+                # An expired row for the same key may still be around until it is purged.
+                IdempotencyKey.objects.filter(expires_at__lte=timezone.now(), **lookup).delete()
+                claim = IdempotencyKey.objects.create(
+                    request_hash=request_hash,
+                    expires_at=timezone.now() + IDEMPOTENCY_KEY_TTL,
+                    **lookup,
+                )
+        except IntegrityError:
+            stored = IdempotencyKey.objects.filter(**lookup).first()
+            if stored is None:
+                # The other request failed and released the key in the meantime.
+                return JsonResponse({'error': 'Request with this Idempotency-Key failed, retry'}, status=409)
+            if stored.request_hash != request_hash:
+                return JsonResponse({'error': 'Idempotency-Key reused with a different request'}, status=422)
+            if stored.status is None:
+                return JsonResponse({'error': 'Request with this Idempotency-Key is still in progress'}, status=409)
+            response = HttpResponse(bytes(stored.body), status=stored.status, content_type=stored.content_type)
+            response['Idempotent-Replayed'] = 'true'
+            return response
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            claim.delete()
+            raise
+        if response.status_code >= 500:
+            claim.delete()
+            return response
+        claim.status = response.status_code
+        claim.content_type = response['Content-Type']
+        claim.body = response.content
+        claim.save(update_fields=['status', 'content_type', 'body'])
+        return response
+    return wrapper
+
+
+def purge_expired_keys():
+    count, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return count
@@ -0,0 +1,65 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.db import DatabaseError
+from django.http import JsonResponse, StreamingHttpResponse
+import csv
+import json
+from .importer import decode_lines, import_books
+from .auth import api_login_required
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+def _detect_format(request, filename=''):
+    fmt = request.GET.get('format')
+    if fmt:
+        return fmt
+    if filename.endswith(('.ndjson', '.jsonl')) or request.content_type == 'application/x-ndjson':
+        return 'ndjson'
+    return 'csv'
+
+
+def _progress_stream(lines, fmt, owner):
+    totals = {'processed': 0, 'created': 0, 'duplicates': 0, 'errors': 0}
+    try:
+        for progress in import_books(lines, fmt, owner):
+            totals['processed'] = progress['processed']
+            totals['created'] += progress['created']
+            totals['duplicates'] += progress['duplicates']
+            totals['errors'] += len(progress['errors'])
+            yield json.dumps(progress) + '\n'
+    except (UnicodeDecodeError, csv.Error, DatabaseError) as e:
+        # Chunks already imported stay committed; report where the import stopped.
+        yield json.dumps({'done': False, 'error': str(e), **totals}) + '\n'
+        return
+    yield json.dumps({'done': True, **totals}) + '\n'
+
+
+@csrf_exempt
+@api_login_required
+def bulk_import_books(request):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'POST':
+        # Either a multipart upload in the 'file' field or the raw file as the request body.
+        # Both are read line by line, never as a whole.
+        if request.content_type == 'multipart/form-data':
+            upload = request.FILES.get('file')
+            if upload is None:
+                return JsonResponse({'error': 'Missing file'}, status=400)
+            fmt = _detect_format(request, upload.name)
+            source = upload
+        else:
+            fmt = _detect_format(request)
+            source = request
+        if fmt not in IMPORT_FORMATS:
+            return JsonResponse({'error': 'Unsupported format'}, status=400)
+        # Progress is streamed as one JSON object per chunk, followed by the totals.
+        return StreamingHttpResponse(
+            _progress_stream(decode_lines(source), fmt, request.user),
+            content_type='application/x-ndjson',
+        )
+    return JsonResponse({'error': 'Invalid method'}, status=405)
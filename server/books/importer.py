@@ -0,0 +1,117 @@
+import codecs
+import csv
+import json
+from django.db import transaction
+from .models import Book
+
+IMPORT_CHUNK_SIZE = 500
+
+# Column names used by Goodreads and StoryGraph exports, plus our own field names.
+TITLE_COLUMNS = ('Title', 'title')
+AUTHOR_COLUMNS = ('Author', 'Authors', 'author')
+NOTES_COLUMNS = ('My Review', 'Review', 'Private Notes', 'notes')
+COVER_COLUMNS = ('coverImage',)
+
+
+def _first_value(row, columns):
+    for column in columns:
+        value = row.get(column)
+        if value:
+            return value.strip() if isinstance(value, str) else value
+    return ''
+
+
+def _csv_rows(lines):
+    yield from csv.DictReader(lines)
+
+
+def _ndjson_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield e
+            continue
+        yield row if isinstance(row, dict) else ValueError('Expected a JSON object')
+
+
+def _validate(row, owner):
+    title = _first_value(row, TITLE_COLUMNS)
+    author = _first_value(row, AUTHOR_COLUMNS)
+    if not title or not author:
+        raise ValueError('Missing title or author')
+    if not isinstance(title, str) or not isinstance(author, str):
+        raise ValueError('Title and author must be strings')
+    if len(title) > 255 or len(author) > 255:
+        raise ValueError('Title or author longer than 255 characters')
+    notes = _first_value(row, NOTES_COLUMNS)
+    cover_image = _first_value(row, COVER_COLUMNS)
+    # NDJSON values can be any JSON type; only strings are stored as they are.
+    if not isinstance(notes, str) or not isinstance(cover_image, str):
+        raise ValueError('Notes and cover image must be strings')
+    # StoryGraph lists several authors separated by commas; keep the first one.
+    if 'Authors' in row and ',' in author:
+        author = author.split(',')[0].strip()
+    return Book(
+        owner=owner,
+        title=title,
+        author=author,
+        notes=notes,
+        cover_image=cover_image or None,
+    )
+
+
+def _insert_chunk(books, owner):
+    """Insert the books owner does not already have, returns the number created."""
+    unique = {}
+    for book in books:
+        unique.setdefault((book.title, book.author), book)
+    if not unique:
+        return 0
+    # Prefilter on title only, one IN list per chunk, and match the authors here.
+    titles = {title for title, _ in unique}
+    with transaction.atomic():
+        existing = set(Book.objects.filter(owner=owner, title__in=titles).values_list('title', 'author'))
+        new_books = [book for key, book in unique.items() if key not in existing]
+        Book.objects.bulk_create(new_books)
+    return len(new_books)
+
+
+def import_books(lines, fmt, owner, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import books for owner from an iterable of text lines in 'csv' or 'ndjson' format.
+
+    Rows are parsed lazily and inserted in chunks, each inside its own
+    transaction, skipping any (title, author) pair that already exists.
+    Yields a progress dict after every chunk with that chunk's row errors.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    rows = _csv_rows(lines) if fmt == 'csv' else _ndjson_rows(lines)
+    processed = 0
+    batch = []
+    errors = []
+    for row_number, row in enumerate(rows, start=1):
+        processed += 1
+        try:
+            if isinstance(row, Exception):
+                raise row
+            batch.append(_validate(row, owner))
+        except ValueError as e:
+            errors.append({'row': row_number, 'error': str(e)})
+        if processed % chunk_size == 0:
+            created = _insert_chunk(batch, owner)
+            yield {'processed': processed, 'created': created, 'duplicates': len(batch) - created, 'errors': errors}
+            batch = []
+            errors = []
+    if processed % chunk_size:
+        created = _insert_chunk(batch, owner)
+        yield {'processed': processed, 'created': created, 'duplicates': len(batch) - created, 'errors': errors}
+
+
+def decode_lines(byte_lines):
+    """Decode an iterable of byte lines as UTF-8, dropping a leading BOM."""
+    return codecs.iterdecode(byte_lines, 'utf-8-sig')
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from books.models import Book
+
+
+class Command(BaseCommand):
+    help = 'Assign books created before user accounts existed (no owner) to a user.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            owner = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User not found: {options['username']}")
+        count = Book.objects.filter(owner__isnull=True).update(owner=owner)
+        self.stdout.write(self.style.SUCCESS(f'Assigned {count} books to {owner.username}'))
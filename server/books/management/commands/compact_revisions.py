@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max
+from books.models import Book, ChapterNote, TextRevision
+from books.revisions import encode_snapshot, rebuild_revision
+
+
+class Command(BaseCommand):
+    help = 'Drop old note and book revisions, keeping the most recent ones per note/book.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=50, help='Revisions to keep per note/book.')
+
+    def handle(self, *args, **options):
+        keep = max(1, options['keep'])
+        deleted = 0
+        for model, field in ((ChapterNote, 'note'), (Book, 'book')):
+            targets = (
+                TextRevision.objects.filter(**{f'{field}__isnull': False})
+                .values(field).annotate(count=Count('id'), last=Max('number'))
+                .filter(count__gt=keep)
+            )
+            for row in targets:
+                cutoff = row['last'] - keep + 1
+                with transaction.atomic():
+                    target = model.objects.select_for_update().get(id=row[field])
+                    # The oldest kept revision becomes a snapshot so it no longer
+                    # depends on the deltas being dropped.
+                    text = rebuild_revision(target, cutoff)
+                    target.revisions.filter(number=cutoff).update(is_snapshot=True, data=encode_snapshot(text))
+                    count, _ = target.revisions.filter(number__lt=cutoff).delete()
+                deleted += count
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} revisions'))
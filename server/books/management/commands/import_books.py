@@ -0,0 +1,39 @@
+from pathlib import Path
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from books.importer import IMPORT_CHUNK_SIZE, import_books
+
+
+class Command(BaseCommand):
+    help = 'Import books from a CSV (Goodreads/StoryGraph export) or NDJSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='Username of the owner of the imported books.')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'File not found: {path}')
+        User = get_user_model()
+        try:
+            owner = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User not found: {options['user']}")
+        fmt = options['format'] or ('ndjson' if path.suffix in ('.ndjson', '.jsonl') else 'csv')
+        created = duplicates = errors = 0
+        with path.open(encoding='utf-8-sig', newline='') as f:
+            for progress in import_books(f, fmt, owner, options['chunk_size']):
+                created += progress['created']
+                duplicates += progress['duplicates']
+                errors += len(progress['errors'])
+                for error in progress['errors']:
+                    self.stderr.write(f"Row {error['row']}: {error['error']}")
+                self.stdout.write(f"Processed {progress['processed']} rows")
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created} books, skipped {duplicates} duplicates, {errors} rows with errors'
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from books.stats import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the note and comment statistics rollup from scratch.'
+
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} rollup rows'))
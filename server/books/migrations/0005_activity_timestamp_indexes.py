@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_notecomment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chapternote',
+            index=models.Index(fields=['timestamp'], name='chapternote_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notecomment',
+            index=models.Index(fields=['timestamp'], name='notecomment_timestamp_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_book_title_author_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('is_snapshot', models.BooleanField(default=False)),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('book', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='books.book')),
+                ('note', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='books.chapternote')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['note', 'number'], name='textrevision_note_number_idx'), models.Index(fields=['book', 'number'], name='textrevision_book_number_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0008_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('kind', models.CharField(max_length=10)),
+                ('annotator', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to='books.book')),
+                ('chapter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to='books.chapter')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['book', 'day'], name='activityrollup_book_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='activityrollup',
+            constraint=models.UniqueConstraint(fields=('chapter', 'day', 'kind', 'annotator'), name='activityrollup_unique_bucket'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0010_book_owner'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='chapternote',
+            name='chapternote_timestamp_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notecomment',
+            name='notecomment_timestamp_idx',
+        ),
+        migrations.AddIndex(
+            model_name='chapternote',
+            index=models.Index(fields=['chapter', 'timestamp'], name='chapternote_chapter_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notecomment',
+            index=models.Index(fields=['note', 'timestamp'], name='notecomment_note_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0011_activity_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='textrevision',
+            name='textrevision_note_number_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='textrevision',
+            name='textrevision_book_number_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='textrevision',
+            constraint=models.UniqueConstraint(fields=('note', 'number'), name='textrevision_unique_note_number'),
+        ),
+        migrations.AddConstraint(
+            model_name='textrevision',
+            constraint=models.UniqueConstraint(fields=('book', 'number'), name='textrevision_unique_book_number'),
+        ),
+    ]
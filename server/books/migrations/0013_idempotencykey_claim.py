@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0012_textrevision_unique_number'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='body',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='content_type',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='status',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+    ]
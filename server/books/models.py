@@ -1,12 +1,19 @@
+from django.conf import settings
 from django.db import models
 
 class Book(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='books', on_delete=models.CASCADE, null=True, blank=True)
     title = models.CharField(max_length=255)
     author = models.CharField(max_length=255)
     notes = models.TextField(blank=True)
     cover_image = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'title', 'author'], name='book_owner_title_author_idx'),
+            models.Index(fields=['owner', 'created_at'], name='book_owner_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -29,6 +36,11 @@ class ChapterNote(models.Model):
     author = models.CharField(max_length=255)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['chapter', 'timestamp'], name='chapternote_chapter_ts_idx'),
+        ]
+
     def __str__(self):
         return f"Note by {self.author} on {self.chapter.title}"
 
@@ -40,5 +52,92 @@ class NoteComment(models.Model):
     author = models.CharField(max_length=255)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['note', 'timestamp'], name='notecomment_note_ts_idx'),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author} on note {self.note.id}"
+
+
+class TextRevision(models.Model):
+    # Edit history of ChapterNote.content or Book.notes; exactly one of note/book is set.
+    # Every SNAPSHOT_INTERVAL-th revision stores the full text, the others a delta
+    # against the previous revision (see books/revisions.py).
+    note = models.ForeignKey(ChapterNote, related_name='revisions', on_delete=models.CASCADE, null=True, blank=True)
+    book = models.ForeignKey(Book, related_name='revisions', on_delete=models.CASCADE, null=True, blank=True)
+    number = models.PositiveIntegerField()
+    is_snapshot = models.BooleanField(default=False)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['note', 'number'], name='textrevision_unique_note_number'),
+            models.UniqueConstraint(fields=['book', 'number'], name='textrevision_unique_book_number'),
+        ]
+
+    def __str__(self):
+        target = f"note {self.note_id}" if self.note_id else f"book {self.book_id}"
+        return f"Revision {self.number} of {target}"
+
+
+class IdempotencyKey(models.Model):
+    # Stored response of a create/update request, replayed when a client retries
+    # with the same Idempotency-Key header until expires_at. The row is claimed
+    # before the view runs; status stays null while the request is in progress.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE, null=True)
+    key = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status = models.PositiveSmallIntegerField(null=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body = models.BinaryField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key', 'method', 'path'], name='idempotencykey_unique_request'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotencykey_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.key})"
+
+
+class ActivityRollup(models.Model):
+    # Daily count of notes or comments per chapter and annotator, kept up to date
+    # on writes (see books/stats.py) so statistics never scan the note tables.
+    book = models.ForeignKey(Book, related_name='activity_rollups', on_delete=models.CASCADE)
+    chapter = models.ForeignKey(Chapter, related_name='activity_rollups', on_delete=models.CASCADE)
+    day = models.DateField()
+    kind = models.CharField(max_length=10)
+    annotator = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['chapter', 'day', 'kind', 'annotator'], name='activityrollup_unique_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['book', 'day'], name='activityrollup_book_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.count} {self.kind}s by {self.annotator} on chapter {self.chapter_id} ({self.day})"
+
+
+class AuthToken(models.Model):
+    # API token sent by the client as "Authorization: Token <key>"; only a
+    # SHA-256 hash of the key is stored (see books/auth.py).
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='auth_tokens', on_delete=models.CASCADE)
+    key_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Token for {self.user}"
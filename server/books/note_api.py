@@ -2,8 +2,12 @@ from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 import json
 from .models import Chapter, ChapterNote
+from .idempotency import idempotent
+from .auth import api_login_required
 
 @csrf_exempt
+@api_login_required
+@idempotent
 def add_note(request, chapter_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -18,7 +22,7 @@ def add_note(request, chapter_id):
             author = data.get('author')
             if not content or not author:
                 return JsonResponse({'error': 'Missing content or author'}, status=400)
-            chapter = Chapter.objects.get(id=chapter_id)
+            chapter = Chapter.objects.get(id=chapter_id, book__owner=request.user)
             note = ChapterNote.objects.create(
                 chapter=chapter,
                 content=content,
@@ -1,6 +1,8 @@
 from django.http import JsonResponse
 from .models import Chapter, ChapterNote
+from .auth import api_login_required
 
+@api_login_required
 def list_notes(request, chapter_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -10,7 +12,7 @@ def list_notes(request, chapter_id):
         return response
     if request.method == 'GET':
         try:
-            chapter = Chapter.objects.get(id=chapter_id)
+            chapter = Chapter.objects.get(id=chapter_id, book__owner=request.user)
             notes = chapter.notes.all().order_by('-timestamp')
             data = [
                 {
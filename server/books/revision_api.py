@@ -0,0 +1,110 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.db import transaction
+from django.http import JsonResponse
+from .models import Book, ChapterNote
+from .revisions import rebuild_revision, record_revision
+from .idempotency import idempotent
+from .auth import api_login_required
+
+
+def _list_revisions(target):
+    revisions = target.revisions.order_by('-number').values('number', 'is_snapshot', 'created_at')
+    data = [
+        {
+            'number': rev['number'],
+            'isSnapshot': rev['is_snapshot'],
+            'createdAt': rev['created_at'].isoformat(),
+        }
+        for rev in revisions
+    ]
+    return JsonResponse(data, safe=False)
+
+
+def _revision(request, target, field, number):
+    text = rebuild_revision(target, number)
+    if text is None:
+        return JsonResponse({'error': 'Revision not found'}, status=404)
+    if request.method == 'POST':
+        # Restoring is itself an edit, so it becomes the newest revision.
+        with transaction.atomic():
+            target = type(target).objects.select_for_update(of=('self',)).get(pk=target.pk)
+            record_revision(target, getattr(target, field), text)
+            setattr(target, field, text)
+            target.save()
+    return JsonResponse({'number': number, 'content': text}, status=200)
+
+
+@csrf_exempt
+@api_login_required
+def list_note_revisions(request, note_id):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'GET':
+        try:
+            return _list_revisions(ChapterNote.objects.get(id=note_id, chapter__book__owner=request.user))
+        except ChapterNote.DoesNotExist:
+            return JsonResponse({'error': 'Note not found'}, status=404)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
+
+
+# GET returns the text of a revision, POST restores it.
+@csrf_exempt
+@api_login_required
+@idempotent
+def note_revision(request, note_id, number):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method in ('GET', 'POST'):
+        try:
+            return _revision(request, ChapterNote.objects.get(id=note_id, chapter__book__owner=request.user), 'content', number)
+        except ChapterNote.DoesNotExist:
+            return JsonResponse({'error': 'Note not found'}, status=404)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
+
+
+@csrf_exempt
+@api_login_required
+def list_book_revisions(request, book_id):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'GET':
+        try:
+            return _list_revisions(Book.objects.get(id=book_id, owner=request.user))
+        except Book.DoesNotExist:
+            return JsonResponse({'error': 'Book not found'}, status=404)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
+
+
+# GET returns the text of a revision, POST restores it.
+@csrf_exempt
+@api_login_required
+@idempotent
+def book_revision(request, book_id, number):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method in ('GET', 'POST'):
+        try:
+            return _revision(request, Book.objects.get(id=book_id, owner=request.user), 'notes', number)
+        except Book.DoesNotExist:
+            return JsonResponse({'error': 'Book not found'}, status=404)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse({'error': 'Invalid method'}, status=405)
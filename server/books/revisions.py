@@ -0,0 +1,157 @@
+import difflib
+import json
+import re
+import zlib
+
+# A full snapshot is stored every SNAPSHOT_INTERVAL revisions, so rebuilding any
+# revision applies at most SNAPSHOT_INTERVAL - 1 deltas.
+SNAPSHOT_INTERVAL = 10
+
+
+# A word or punctuation character with the whitespace after it; together the
+# tokens cover every character of a line.
+_TOKEN = re.compile(r'\w+\s*|[^\w\s]\s*|\s+')
+
+
+def _line_delta(old, new):
+    """Word-level delta turning line old into new, with copy/skip counts in characters."""
+    # Autosaves mostly append to or change a few words of the line; trimming the
+    # common ends keeps the word diff small even on long paragraphs.
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    a = _TOKEN.findall(old[prefix:len(old) - suffix])
+    b = _TOKEN.findall(new[prefix:len(new) - suffix])
+    ops = [prefix] if prefix else []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            ops.append(sum(map(len, a[i1:i2])))
+            continue
+        if i2 > i1:
+            ops.append(-sum(map(len, a[i1:i2])))
+        if j2 > j1:
+            ops.append(''.join(b[j1:j2]))
+    if suffix:
+        ops.append(suffix)
+    return ops
+
+
+def make_delta(old, new):
+    """
+    Line-based delta turning old into new. Each op is an int n > 0 (copy n lines
+    of old), an int n < 0 (skip -n lines of old), a string (insert it) or a list
+    (rewrite the next line of old with these ops, counted in characters).
+    """
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            ops.append(i2 - i1)
+            continue
+        skip = 0
+        insert = ''
+        # Most notes are a single paragraph, so a changed line is usually an
+        # edited one; store the edit when it is smaller than the whole line.
+        if tag == 'replace':
+            for old_line, new_line in zip(a[i1:i2], b[j1:j2]):
+                line_ops = _line_delta(old_line, new_line)
+                if len(json.dumps(line_ops)) >= len(json.dumps(new_line)):
+                    skip += 1
+                    insert += new_line
+                    continue
+                if skip:
+                    ops.append(-skip)
+                if insert:
+                    ops.append(insert)
+                ops.append(line_ops)
+                skip = 0
+                insert = ''
+            paired = min(i2 - i1, j2 - j1)
+            i1 += paired
+            j1 += paired
+        skip += i2 - i1
+        insert += ''.join(b[j1:j2])
+        if skip:
+            ops.append(-skip)
+        if insert:
+            ops.append(insert)
+    return ops
+
+
+def _apply_ops(old, ops):
+    # old is a list of lines or, for the ops of a single line, a string.
+    out = []
+    pos = 0
+    for op in ops:
+        if isinstance(op, str):
+            out.append(op)
+        elif isinstance(op, list):
+            out.append(_apply_ops(old[pos], op))
+            pos += 1
+        elif op > 0:
+            out.append(''.join(old[pos:pos + op]))
+            pos += op
+        else:
+            pos -= op
+    return ''.join(out)
+
+
+def apply_delta(old, ops):
+    return _apply_ops(old.splitlines(keepends=True), ops)
+
+
+def encode_snapshot(text):
+    return zlib.compress(text.encode())
+
+
+def encode_delta(old, new):
+    return zlib.compress(json.dumps(make_delta(old, new), separators=(',', ':')).encode())
+
+
+def decode_snapshot(data):
+    return zlib.decompress(data).decode()
+
+
+def decode_delta(data):
+    return json.loads(zlib.decompress(data))
+
+
+def record_revision(target, old_text, new_text):
+    """
+    Record new_text as the next revision of target (a ChapterNote or Book).
+    old_text is the currently stored text; on the first edit it becomes revision 1.
+    """
+    if old_text == new_text:
+        return None
+    last = target.revisions.order_by('-number').first()
+    if last is None:
+        last = target.revisions.create(number=1, is_snapshot=True, data=encode_snapshot(old_text))
+    number = last.number + 1
+    if number % SNAPSHOT_INTERVAL == 0:
+        return target.revisions.create(number=number, is_snapshot=True, data=encode_snapshot(new_text))
+    return target.revisions.create(number=number, data=encode_delta(old_text, new_text))
+
+
+def rebuild_revision(target, number):
+    """Return the text of revision number of target, or None if it does not exist."""
+    base = (
+        target.revisions.filter(is_snapshot=True, number__lte=number)
+        .order_by('-number').values_list('number', flat=True).first()
+    )
+    if base is None:
+        return None
+    revisions = list(
+        target.revisions.filter(number__gte=base, number__lte=number)
+        .order_by('number').values_list('number', 'data')
+    )
+    if revisions[-1][0] != number:
+        return None
+    text = decode_snapshot(revisions[0][1])
+    for _, data in revisions[1:]:
+        text = apply_delta(text, decode_delta(data))
+    return text
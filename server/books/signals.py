@@ -0,0 +1,72 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .activity_api import invalidate_activity_cache
+from .models import Book, Chapter, ChapterNote, NoteComment
+from .stats import record_activity
+
+
+def _cascaded(origin):
+    # Deleting a book or chapter removes its rollup rows by cascade, and the
+    # delete views invalidate the activity cache once, so per-row work is skipped.
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (Book, Chapter))
+
+
+def _note_book_id(note):
+    # The views load the chapter with the note; only look it up when it is not cached.
+    if ChapterNote.chapter.is_cached(note):
+        return note.chapter.book_id
+    return Chapter.objects.filter(id=note.chapter_id).values_list('book_id', flat=True).first()
+
+
+def _comment_parent(comment, note=None):
+    if note is None and NoteComment.note.is_cached(comment):
+        note = comment.note
+    if note is not None and ChapterNote.chapter.is_cached(note):
+        return note.chapter_id, note.chapter.book_id
+    return ChapterNote.objects.filter(id=comment.note_id).values_list('chapter_id', 'chapter__book_id').first()
+
+
+def _note_changed(note, delta):
+    book_id = _note_book_id(note)
+    if book_id is None:
+        return
+    invalidate_activity_cache(book_id)
+    if delta:
+        record_activity(book_id, note.chapter_id, 'note', note.author, note.timestamp, delta)
+
+
+def _comment_changed(comment, delta, note=None):
+    parent = _comment_parent(comment, note)
+    if parent is None:
+        return
+    chapter_id, book_id = parent
+    invalidate_activity_cache(book_id)
+    if delta:
+        record_activity(book_id, chapter_id, 'comment', comment.author, comment.timestamp, delta)
+
+
+@receiver(post_save, sender=ChapterNote)
+def note_saved(sender, instance, created, **kwargs):
+    _note_changed(instance, 1 if created else 0)
+
+
+@receiver(post_delete, sender=ChapterNote)
+def note_deleted(sender, instance, origin=None, **kwargs):
+    if _cascaded(origin):
+        return
+    _note_changed(instance, -1)
+
+
+@receiver(post_save, sender=NoteComment)
+def comment_saved(sender, instance, created, **kwargs):
+    _comment_changed(instance, 1 if created else 0)
+
+
+@receiver(post_delete, sender=NoteComment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if _cascaded(origin):
+        return
+    # When its note is deleted, the note is the origin and already has its chapter loaded.
+    _comment_changed(instance, -1, origin if isinstance(origin, ChapterNote) else None)
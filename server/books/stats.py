@@ -0,0 +1,109 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Trunc, TruncDate
+from .models import ActivityRollup, Chapter, ChapterNote, NoteComment
+
+STATS_BUCKETS = ('day', 'week', 'month')
+STATS_TOP = 10
+
+
+def record_activity(book_id, chapter_id, kind, annotator, timestamp, delta):
+    """Add delta to the rollup row of one note or comment."""
+    lookup = {'chapter_id': chapter_id, 'day': timestamp.date(), 'kind': kind, 'annotator': annotator}
+    if ActivityRollup.objects.filter(**lookup).update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ActivityRollup.objects.create(book_id=book_id, count=delta, **lookup)
+    except IntegrityError:
+        # Created concurrently by another write.
+        ActivityRollup.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def move_note_annotator(note, old_author):
+    """Move a note's rollup count to its new author after an edit."""
+    if note.author == old_author:
+        return
+    book_id = note.chapter.book_id
+    record_activity(book_id, note.chapter_id, 'note', old_author, note.timestamp, -1)
+    record_activity(book_id, note.chapter_id, 'note', note.author, note.timestamp, 1)
+
+
+def rebuild_rollups():
+    """Recompute every rollup row from the note and comment tables."""
+    notes = (
+        ChapterNote.objects.annotate(day=TruncDate('timestamp'))
+        .values('chapter_id', 'chapter__book_id', 'day', 'author').annotate(total=Count('id'))
+    )
+    comments = (
+        NoteComment.objects.annotate(day=TruncDate('timestamp'))
+        .values('note__chapter_id', 'note__chapter__book_id', 'day', 'author').annotate(total=Count('id'))
+    )
+    rows = [
+        ActivityRollup(book_id=row['chapter__book_id'], chapter_id=row['chapter_id'], day=row['day'],
+                       kind='note', annotator=row['author'], count=row['total'])
+        for row in notes
+    ] + [
+        ActivityRollup(book_id=row['note__chapter__book_id'], chapter_id=row['note__chapter_id'], day=row['day'],
+                       kind='comment', annotator=row['author'], count=row['total'])
+        for row in comments
+    ]
+    with transaction.atomic():
+        ActivityRollup.objects.all().delete()
+        ActivityRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def compute_stats(rollups, bucket):
+    """Aggregate a queryset of rollup rows into the /books/stats/ payload."""
+    per_chapter = list(
+        rollups.values('chapter_id').annotate(
+            notes=Sum('count', filter=Q(kind='note')),
+            comments=Sum('count', filter=Q(kind='comment')),
+            total=Sum('count'),
+        ).filter(total__gt=0)
+    )
+    chapters = {
+        ch['id']: ch
+        for ch in Chapter.objects.filter(id__in=[row['chapter_id'] for row in per_chapter])
+        .values('id', 'book_id', 'title', 'chapter_number')
+    }
+
+    def chapter_data(row):
+        ch = chapters[row['chapter_id']]
+        return {
+            'chapterId': str(ch['id']),
+            'bookId': str(ch['book_id']),
+            'title': ch['title'],
+            'chapterNumber': ch['chapter_number'],
+            'notes': row['notes'] or 0,
+            'comments': row['comments'] or 0,
+        }
+
+    per_chapter = [row for row in per_chapter if row['chapter_id'] in chapters]
+    notes_per_chapter = sorted(per_chapter, key=lambda row: (chapters[row['chapter_id']]['book_id'],
+                                                             chapters[row['chapter_id']]['chapter_number']))
+    most_annotated = sorted(per_chapter, key=lambda row: -row['total'])[:STATS_TOP]
+    comment_activity = (
+        rollups.filter(kind='comment').annotate(period=Trunc('day', bucket))
+        .values('period').annotate(comments=Sum('count')).filter(comments__gt=0).order_by('period')
+    )
+    top_annotators = (
+        rollups.values('annotator').annotate(
+            notes=Sum('count', filter=Q(kind='note')),
+            comments=Sum('count', filter=Q(kind='comment')),
+            total=Sum('count'),
+        ).filter(total__gt=0).order_by('-total', 'annotator')[:STATS_TOP]
+    )
+    return {
+        'notesPerChapter': [chapter_data(row) for row in notes_per_chapter],
+        'mostAnnotatedChapters': [chapter_data(row) for row in most_annotated],
+        'commentActivity': [
+            {'bucket': row['period'].isoformat(), 'comments': row['comments']}
+            for row in comment_activity
+        ],
+        'topAnnotators': [
+            {'author': row['annotator'], 'notes': row['notes'] or 0, 'comments': row['comments'] or 0}
+            for row in top_annotators
+        ],
+    }
@@ -0,0 +1,39 @@
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
+from .models import ActivityRollup, Book
+from .stats import STATS_BUCKETS, compute_stats
+from .auth import api_login_required
+
+STATS_MAX_AGE = 60
+
+
+@api_login_required
+def book_stats(request):
+    if request.method == 'OPTIONS':
+        response = JsonResponse({'detail': 'CORS preflight'})
+        response["Access-Control-Allow-Origin"] = "*"
+        response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
+        response["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+    if request.method == 'GET':
+        # ?book=<id> for one book, ?author=<name> for all books by an author.
+        book_id = request.GET.get('book')
+        author = request.GET.get('author')
+        bucket = request.GET.get('bucket', 'week')
+        if bucket not in STATS_BUCKETS:
+            return JsonResponse({'error': 'Invalid bucket'}, status=400)
+        rollups = ActivityRollup.objects.filter(book__owner=request.user)
+        if book_id:
+            try:
+                book_id = int(book_id)
+            except ValueError:
+                return JsonResponse({'error': 'Invalid book'}, status=400)
+            if not Book.objects.filter(id=book_id, owner=request.user).exists():
+                return JsonResponse({'error': 'Book not found'}, status=404)
+            rollups = rollups.filter(book_id=book_id)
+        if author:
+            rollups = rollups.filter(book__author=author)
+        response = JsonResponse(compute_stats(rollups, bucket))
+        patch_cache_control(response, private=True, max_age=STATS_MAX_AGE)
+        return response
+    return JsonResponse({'error': 'Invalid method'}, status=405)
@@ -0,0 +1,573 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from .auth import create_token
+from .importer import import_books
+from .models import ActivityRollup, Book, Chapter, ChapterNote, IdempotencyKey, NoteComment
+from .revisions import (
+    SNAPSHOT_INTERVAL, apply_delta, decode_delta, encode_delta, make_delta, rebuild_revision,
+)
+
+
+def make_client(username):
+    user = get_user_model().objects.create_user(username=username, password='unused-password')
+    return user, Client(HTTP_AUTHORIZATION=f'Token {create_token(user)}')
+
+
+class DeltaTests(TestCase):
+    def test_round_trip(self):
+        cases = [
+            ('', ''),
+            ('', 'first line\nsecond line'),
+            ('only line', ''),
+            ('a\nb\nc\n', 'a\nB\nc\n'),
+            ('a\nb\nc', 'a\nb\nc\nd'),
+            ('a\nb\nc\nd', 'b\nd'),
+            ('no trailing newline', 'no trailing newline\n'),
+            ('windows\r\nline endings\r\n', 'windows\r\nline\r\nendings\r\n'),
+            ('x\ny\nz', 'z\ny\nx'),
+            ('the cat sat on the mat', 'the dog sat on the mat'),
+            ('one paragraph', 'one paragraph, now a little longer.'),
+            ('first line\nsecond line', 'first lines\nsecond\nthird'),
+            ('résumé, naïve café', 'résumés — naïve cafés!'),
+        ]
+        for old, new in cases:
+            with self.subTest(old=old, new=new):
+                self.assertEqual(apply_delta(old, make_delta(old, new)), new)
+                self.assertEqual(apply_delta(old, decode_delta(encode_delta(old, new))), new)
+
+    def test_edit_within_a_paragraph_stores_only_the_change(self):
+        paragraph = ' '.join(f'word{i}' for i in range(500))
+        edited = paragraph.replace('word250 ', 'changed ') + ' and more'
+        ops = make_delta(paragraph, edited)
+        self.assertEqual(apply_delta(paragraph, ops), edited)
+        self.assertLess(len(encode_delta(paragraph, edited)), 60)
+
+    def test_line_deltas_still_apply(self):
+        # Deltas stored before word-level ops existed only copy, skip and insert lines.
+        self.assertEqual(apply_delta('a\nb\nc\n', [1, -1, 'B\n', 1]), 'a\nB\nc\n')
+
+
+class RevisionTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client('reader')
+        self.book = Book.objects.create(owner=self.user, title='Book', author='Author', notes='v0')
+        chapter = Chapter.objects.create(book=self.book, title='One', chapter_number=1)
+        self.note = ChapterNote.objects.create(chapter=chapter, content='v0', author='reader')
+
+    def edit_note(self, content):
+        response = self.client.patch(
+            f'/books/note/{self.note.id}/update/', json.dumps({'content': content}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def edit_book(self, notes):
+        response = self.client.patch(
+            f'/books/{self.book.id}/update/', json.dumps({'notes': notes}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_note_edits_are_recorded(self):
+        versions = ['v0'] + [f'line one\nedit {i}\nline three' for i in range(1, 25)]
+        for text in versions[1:]:
+            self.edit_note(text)
+        self.edit_note(versions[-1])  # unchanged text records nothing
+        revisions = self.client.get(f'/books/note/{self.note.id}/revisions/').json()
+        self.assertEqual([rev['number'] for rev in revisions], list(range(len(versions), 0, -1)))
+        snapshots = [rev['number'] for rev in revisions if rev['isSnapshot']]
+        self.assertEqual(sorted(snapshots), [1] + list(range(SNAPSHOT_INTERVAL, len(versions) + 1, SNAPSHOT_INTERVAL)))
+        for number, text in enumerate(versions, start=1):
+            response = self.client.get(f'/books/note/{self.note.id}/revisions/{number}/')
+            self.assertEqual(response.json(), {'number': number, 'content': text})
+        self.assertEqual(self.client.get(f'/books/note/{self.note.id}/revisions/99/').status_code, 404)
+
+    def test_book_edits_are_recorded(self):
+        self.edit_book('v1')
+        self.edit_book('v2')
+        revisions = self.client.get(f'/books/{self.book.id}/revisions/').json()
+        self.assertEqual([rev['number'] for rev in revisions], [3, 2, 1])
+        self.assertEqual(self.client.get(f'/books/{self.book.id}/revisions/1/').json()['content'], 'v0')
+
+    def test_restore_becomes_newest_revision(self):
+        self.edit_note('v1')
+        self.edit_note('v2')
+        response = self.client.post(f'/books/note/{self.note.id}/revisions/1/')
+        self.assertEqual(response.json(), {'number': 1, 'content': 'v0'})
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.content, 'v0')
+        self.assertEqual(rebuild_revision(self.note, 4), 'v0')
+        self.assertEqual(rebuild_revision(self.note, 3), 'v2')
+
+    def test_rebuild_after_compaction(self):
+        versions = ['v0'] + [f'header\nbody {i}\n' + 'footer\n' * (i % 3) for i in range(1, 30)]
+        for text in versions[1:]:
+            self.edit_note(text)
+            self.edit_book(text)
+        call_command('compact_revisions', keep=7, stdout=StringIO())
+        for target in (self.note, self.book):
+            numbers = list(target.revisions.order_by('number').values_list('number', flat=True))
+            self.assertEqual(numbers, list(range(len(versions) - 6, len(versions) + 1)))
+            self.assertTrue(target.revisions.get(number=numbers[0]).is_snapshot)
+            for number in numbers:
+                self.assertEqual(rebuild_revision(target, number), versions[number - 1])
+            self.assertIsNone(rebuild_revision(target, numbers[0] - 1))
+        # Editing after compaction keeps numbering from where it was.
+        self.edit_note('after')
+        self.assertEqual(rebuild_revision(self.note, len(versions) + 1), 'after')
+
+
+class OwnerIsolationTests(TestCase):
+    def setUp(self):
+        self.owner, self.owner_client = make_client('owner')
+        self.other, self.other_client = make_client('other')
+        self.book = Book.objects.create(owner=self.owner, title='Mine', author='Author', notes='private')
+        self.chapter = Chapter.objects.create(book=self.book, title='One', chapter_number=1)
+        self.note = ChapterNote.objects.create(chapter=self.chapter, content='note', author='owner')
+        self.comment = NoteComment.objects.create(note=self.note, content='comment', author='owner')
+        self.owner_client.patch(
+            f'/books/note/{self.note.id}/update/', json.dumps({'content': 'edited'}), content_type='application/json',
+        )
+
+    def requests(self):
+        body = json.dumps({
+            'title': 'T', 'author': 'A', 'notes': 'N', 'chapterNumber': 2, 'content': 'C',
+        })
+        return [
+            ('get', f'/books/{self.book.id}/chapters/', None),
+            ('get', f'/books/{self.book.id}/activity/', None),
+            ('get', f'/books/{self.book.id}/revisions/', None),
+            ('get', f'/books/stats/?book={self.book.id}', None),
+            ('get', f'/books/chapter/{self.chapter.id}/notes/', None),
+            ('get', f'/books/note/{self.note.id}/comments/', None),
+            ('get', f'/books/note/{self.note.id}/revisions/', None),
+            ('get', f'/books/note/{self.note.id}/revisions/1/', None),
+            ('post', f'/books/note/{self.note.id}/revisions/1/', None),
+            ('post', f'/books/{self.book.id}/add-chapter/', body),
+            ('post', f'/books/chapter/{self.chapter.id}/add-note/', body),
+            ('post', f'/books/note/{self.note.id}/add-comment/', body),
+            ('patch', f'/books/{self.book.id}/update/', body),
+            ('patch', f'/books/chapter/{self.chapter.id}/update/', body),
+            ('patch', f'/books/note/{self.note.id}/update/', body),
+            ('delete', f'/books/comment/{self.comment.id}/delete/', None),
+            ('delete', f'/books/note/{self.note.id}/delete/', None),
+            ('delete', f'/books/chapter/{self.chapter.id}/delete/', None),
+            ('delete', f'/books/{self.book.id}/delete/', None),
+        ]
+
+    def send(self, client, method, path, body):
+        if body is None:
+            return getattr(client, method)(path)
+        return getattr(client, method)(path, body, content_type='application/json')
+
+    def test_other_user_gets_404(self):
+        for method, path, body in self.requests():
+            with self.subTest(method=method, path=path):
+                self.assertEqual(self.send(self.other_client, method, path, body).status_code, 404)
+        self.book.refresh_from_db()
+        self.chapter.refresh_from_db()
+        self.note.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual((self.book.title, self.book.notes), ('Mine', 'private'))
+        self.assertEqual(self.chapter.title, 'One')
+        self.assertEqual(self.note.content, 'edited')
+        self.assertEqual(self.book.chapters.count(), 1)
+        self.assertEqual(self.note.revisions.count(), 2)
+
+    def test_owner_can_use_every_view(self):
+        for method, path, body in self.requests():
+            with self.subTest(method=method, path=path):
+                self.assertLess(self.send(self.owner_client, method, path, body).status_code, 300)
+
+    def test_lists_only_show_own_books(self):
+        Book.objects.create(owner=self.other, title='Theirs', author='Author')
+        self.assertEqual([b['title'] for b in self.owner_client.get('/books/list/').json()], ['Mine'])
+        self.assertEqual([b['title'] for b in self.other_client.get('/books/list/').json()], ['Theirs'])
+        stats = self.other_client.get('/books/stats/?author=Author')
+        self.assertEqual(stats.status_code, 200)
+        self.assertIn('private', stats['Cache-Control'])
+
+    def test_import_only_touches_own_books(self):
+        response = self.other_client.post(
+            '/books/import/?format=ndjson',
+            b'{"title": "Mine", "author": "Author"}\n',
+            content_type='application/x-ndjson',
+        )
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(lines[-1], {'done': True, 'processed': 1, 'created': 1, 'duplicates': 0, 'errors': 0})
+        self.assertEqual(Book.objects.filter(owner=self.owner).count(), 1)
+        self.assertEqual(Book.objects.filter(owner=self.other, title='Mine').count(), 1)
+
+    def test_requests_without_valid_token_get_401(self):
+        anonymous = Client()
+        bad_token = Client(HTTP_AUTHORIZATION='Token not-a-real-token')
+        session = Client()
+        session.force_login(self.owner)
+        paths = ['/books/list/', '/books/import/', '/books/stats/'] + [path for _, path, _ in self.requests()]
+        for client in (anonymous, bad_token, session):
+            for path in paths:
+                with self.subTest(path=path):
+                    self.assertEqual(client.get(path).status_code, 401)
+
+    def test_logout_revokes_token(self):
+        self.assertEqual(self.owner_client.post('/books/auth/logout/').status_code, 200)
+        self.assertEqual(self.owner_client.get('/books/list/').status_code, 401)
+        self.assertEqual(self.other_client.get('/books/list/').status_code, 200)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client('reader')
+
+    def add_book(self, title, key='key-1', client=None):
+        return (client or self.client).post(
+            '/books/add/', json.dumps({'title': title, 'author': 'Author'}),
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self.add_book('Dune')
+        retry = self.add_book('Dune')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertNotIn('Idempotent-Replayed', first)
+        self.assertEqual(Book.objects.filter(owner=self.user).count(), 1)
+
+    def test_key_reused_with_different_body_is_rejected(self):
+        self.add_book('Dune')
+        self.assertEqual(self.add_book('Emma').status_code, 422)
+        self.assertEqual(Book.objects.filter(owner=self.user).count(), 1)
+
+    def test_request_still_in_progress_gets_409(self):
+        body = json.dumps({'title': 'Dune', 'author': 'Author'}).encode()
+        IdempotencyKey.objects.create(
+            user=self.user, key='key-1', method='POST', path='/books/add/',
+            request_hash=hashlib.sha256(body).hexdigest(),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.assertEqual(self.add_book('Dune').status_code, 409)
+        self.assertFalse(Book.objects.exists())
+
+    def test_expired_key_runs_the_view_again(self):
+        self.add_book('Dune')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        retry = self.add_book('Dune')
+        self.assertEqual(retry.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', retry)
+        self.assertEqual(Book.objects.filter(owner=self.user).count(), 2)
+
+    def test_keys_are_scoped_per_user(self):
+        other, other_client = make_client('other')
+        self.add_book('Dune')
+        response = self.add_book('Dune', client=other_client)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Book.objects.get(owner=other).title, 'Dune')
+
+    def test_client_errors_are_stored_but_server_errors_release_the_key(self):
+        self.assertEqual(self.add_book('', key='bad').status_code, 400)
+        self.assertEqual(self.add_book('', key='bad')['Idempotent-Replayed'], 'true')
+        response = self.client.post(
+            '/books/add/', 'not json', content_type='application/json', HTTP_IDEMPOTENCY_KEY='broken',
+        )
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(IdempotencyKey.objects.filter(key='broken').exists())
+
+
+class ActivityCursorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user, self.client = make_client('reader')
+        self.book = Book.objects.create(owner=self.user, title='Book', author='Author')
+        chapter = Chapter.objects.create(book=self.book, title='One', chapter_number=1)
+        # Several notes and comments share timestamps so ties have to be broken by kind and id.
+        base = timezone.now()
+        for i in range(7):
+            note = ChapterNote.objects.create(chapter=chapter, content=f'note {i}', author='reader')
+            ChapterNote.objects.filter(id=note.id).update(timestamp=base - timedelta(minutes=i // 3))
+            for j in range(2):
+                comment = NoteComment.objects.create(note=note, content=f'comment {i}.{j}', author='reader')
+                NoteComment.objects.filter(id=comment.id).update(timestamp=base - timedelta(minutes=i // 2))
+
+    def pages(self, limit):
+        cursor = None
+        while True:
+            query = f'?limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+            page = self.client.get(f'/books/{self.book.id}/activity/{query}').json()
+            yield page['results']
+            cursor = page['nextCursor']
+            if cursor is None:
+                return
+
+    def test_pages_cover_every_item_once_in_order(self):
+        everything = self.client.get(f'/books/{self.book.id}/activity/?limit=100').json()
+        self.assertIsNone(everything['nextCursor'])
+        expected = [(item['type'], item['id']) for item in everything['results']]
+        self.assertEqual(len(expected), 21)
+        for limit in (1, 2, 3, 5, 20, 21, 22):
+            with self.subTest(limit=limit):
+                pages = list(self.pages(limit))
+                self.assertTrue(all(len(page) <= limit for page in pages))
+                self.assertEqual([(item['type'], item['id']) for page in pages for item in page], expected)
+
+    def test_empty_book_has_no_cursor(self):
+        empty = Book.objects.create(owner=self.user, title='Empty', author='Author')
+        self.assertEqual(self.client.get(f'/books/{empty.id}/activity/').json(), {'results': [], 'nextCursor': None})
+
+    def test_non_integer_book_id_gets_404(self):
+        self.assertEqual(self.client.get('/books/abc/activity/').status_code, 404)
+
+    def test_first_page_cache_is_shared_by_equivalent_urls(self):
+        self.assertEqual(len(self.client.get(f'/books/0{self.book.id}/activity/').json()['results']), 20)
+        ChapterNote.objects.create(chapter=self.book.chapters.get(), content='newest', author='reader')
+        first = self.client.get(f'/books/0{self.book.id}/activity/').json()['results'][0]
+        self.assertEqual(first['content'], 'newest')
+
+    def test_invalid_cursor_or_limit_gets_400(self):
+        for query in ('cursor=%%%', 'cursor=bm90LWEtY3Vyc29y', 'cursor=MjAyNHxub3RlfDE=', 'limit=abc'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/books/{self.book.id}/activity/?{query}').status_code, 400)
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client('reader')
+
+    def post(self, body, fmt, content_type='text/plain'):
+        response = self.client.post(f'/books/import/?format={fmt}', body, content_type=content_type)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def books(self):
+        return list(Book.objects.filter(owner=self.user).order_by('id').values_list('title', 'author', 'notes'))
+
+    def test_goodreads_csv(self):
+        body = (
+            'Book Id,Title,Author,My Rating,My Review\n'
+            '1,Dune,Frank Herbert,5,"Loved it.\nSecond paragraph, with a comma."\n'
+            '2,Emma,Jane Austen,4,\n'
+        ).encode()
+        lines = self.post(body, 'csv', 'text/csv')
+        self.assertEqual(lines[-1], {'done': True, 'processed': 2, 'created': 2, 'duplicates': 0, 'errors': 0})
+        self.assertEqual(self.books(), [
+            ('Dune', 'Frank Herbert', 'Loved it.\nSecond paragraph, with a comma.'),
+            ('Emma', 'Jane Austen', ''),
+        ])
+
+    def test_storygraph_keeps_first_author(self):
+        upload = SimpleUploadedFile(
+            'storygraph.csv', '\ufeffTitle,Authors,Review\nGood Omens,"Terry Pratchett, Neil Gaiman",Funny\n'.encode(),
+        )
+        response = self.client.post('/books/import/', {'file': upload})
+        self.assertEqual(json.loads(b''.join(response.streaming_content).splitlines()[-1])['created'], 1)
+        self.assertEqual(self.books(), [('Good Omens', 'Terry Pratchett', 'Funny')])
+
+    def test_row_errors_are_reported_with_row_numbers(self):
+        body = '\n'.join([
+            '{"title": "Dune", "author": "Frank Herbert"}',
+            'not json',
+            '["a list"]',
+            '{"title": "No author"}',
+            '{"title": "Dune", "author": "Frank Herbert", "notes": {"a": 1}}',
+            '{"title": "Dune", "author": "Frank Herbert", "coverImage": [1]}',
+            '{"title": 5, "author": "Someone"}',
+            '{"title": "' + 'x' * 256 + '", "author": "Someone"}',
+        ]).encode()
+        progress, done = self.post(body, 'ndjson')
+        self.assertEqual([error['row'] for error in progress['errors']], [2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(progress['errors'][2]['error'], 'Missing title or author')
+        self.assertEqual(progress['errors'][3]['error'], 'Notes and cover image must be strings')
+        self.assertEqual(done, {'done': True, 'processed': 8, 'created': 1, 'duplicates': 0, 'errors': 7})
+        self.assertEqual(self.books(), [('Dune', 'Frank Herbert', '')])
+
+    def test_duplicates_are_skipped(self):
+        Book.objects.create(owner=self.user, title='Dune', author='Frank Herbert')
+        Book.objects.create(owner=make_client('other')[0], title='Emma', author='Jane Austen')
+        rows = [
+            {'title': 'Dune', 'author': 'Frank Herbert'},
+            {'title': 'Dune', 'author': 'Brian Herbert'},
+            {'title': 'Emma', 'author': 'Jane Austen'},
+            {'title': 'Emma', 'author': 'Jane Austen'},
+        ]
+        lines = self.post('\n'.join(json.dumps(row) for row in rows).encode(), 'ndjson')
+        self.assertEqual(lines[-1], {'done': True, 'processed': 4, 'created': 2, 'duplicates': 2, 'errors': 0})
+        self.assertEqual(sorted(self.books()), [
+            ('Dune', 'Brian Herbert', ''), ('Dune', 'Frank Herbert', ''), ('Emma', 'Jane Austen', ''),
+        ])
+
+    def test_chunks_are_reported_and_deduplicated_across_chunks(self):
+        rows = [json.dumps({'title': f'Book {i % 4}', 'author': 'Author'}) for i in range(7)]
+        progress = list(import_books(rows, 'ndjson', self.user, chunk_size=3))
+        self.assertEqual([p['processed'] for p in progress], [3, 6, 7])
+        self.assertEqual([(p['created'], p['duplicates']) for p in progress], [(3, 0), (1, 2), (0, 1)])
+        with self.assertRaises(ValueError):
+            list(import_books(rows, 'ndjson', self.user, chunk_size=0))
+
+    def test_large_chunk(self):
+        rows = [json.dumps({'title': f'Book {i}', 'author': f'Author {i % 7}'}) for i in range(1200)]
+        progress = list(import_books(rows + rows[:10], 'ndjson', self.user, chunk_size=999))
+        self.assertEqual(sum(p['created'] for p in progress), 1200)
+        self.assertEqual(sum(p['duplicates'] for p in progress), 10)
+
+    def test_stream_stops_with_error_line(self):
+        lines = self.post(b'{"title": "Dune", "author": "Frank Herbert"}\n\xff\n', 'ndjson')
+        self.assertFalse(lines[-1]['done'])
+        self.assertIn('utf-8', lines[-1]['error'])
+        with mock.patch.object(Book.objects, 'bulk_create', side_effect=DatabaseError('connection lost')):
+            lines = self.post(b'{"title": "Emma", "author": "Jane Austen"}\n', 'ndjson')
+        self.assertEqual(lines, [{
+            'done': False, 'error': 'connection lost', 'processed': 0, 'created': 0, 'duplicates': 0, 'errors': 0,
+        }])
+
+    def test_unsupported_format_gets_400(self):
+        self.assertEqual(self.client.post('/books/import/?format=xml', b'', content_type='text/xml').status_code, 400)
+
+    def test_import_books_command(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'books.jsonl'
+            path.write_text('{"title": "Dune", "author": "Frank Herbert"}\n{"title": "Dune"}\n')
+            out, err = StringIO(), StringIO()
+            call_command('import_books', str(path), user='reader', chunk_size=1, stdout=out, stderr=err)
+            self.assertIn('Created 1 books, skipped 0 duplicates, 1 rows with errors', out.getvalue())
+            self.assertIn('Row 2: Missing title or author', err.getvalue())
+            self.assertEqual(self.books(), [('Dune', 'Frank Herbert', '')])
+            for options, message in (
+                ({'user': 'nobody'}, 'User not found'),
+                ({'user': 'reader', 'chunk_size': 0}, 'at least 1'),
+            ):
+                with self.assertRaisesMessage(CommandError, message):
+                    call_command('import_books', str(path), stdout=StringIO(), **options)
+
+
+class StatsTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client('reader')
+        self.book = Book.objects.create(owner=self.user, title='Dune', author='Frank Herbert')
+        self.chapter = Chapter.objects.create(book=self.book, title='One', chapter_number=1)
+        self.other_chapter = Chapter.objects.create(book=self.book, title='Two', chapter_number=2)
+
+    def add_note(self, chapter, author):
+        response = self.client.post(
+            f'/books/chapter/{chapter.id}/add-note/', json.dumps({'content': 'note', 'author': author}),
+            content_type='application/json',
+        )
+        return response.json()['id']
+
+    def add_comment(self, note_id, author):
+        response = self.client.post(
+            f'/books/note/{note_id}/add-comment/', json.dumps({'content': 'comment', 'author': author}),
+            content_type='application/json',
+        )
+        return response.json()['id']
+
+    def counts(self):
+        rows = ActivityRollup.objects.filter(count__gt=0).values_list('chapter_id', 'kind', 'annotator', 'count')
+        return {(chapter_id, kind, annotator): count for chapter_id, kind, annotator, count in rows}
+
+    def stats(self, query=''):
+        response = self.client.get(f'/books/stats/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_counts_follow_creates_and_deletes(self):
+        note = self.add_note(self.chapter, 'alice')
+        first = self.add_comment(note, 'bob')
+        self.add_comment(note, 'bob')
+        self.add_note(self.other_chapter, 'alice')
+        self.assertEqual(self.counts(), {
+            (self.chapter.id, 'note', 'alice'): 1,
+            (self.chapter.id, 'comment', 'bob'): 2,
+            (self.other_chapter.id, 'note', 'alice'): 1,
+        })
+        self.client.delete(f'/books/comment/{first}/delete/')
+        self.assertEqual(self.counts()[(self.chapter.id, 'comment', 'bob')], 1)
+        # Deleting the note also removes its remaining comment from the counts.
+        self.client.delete(f'/books/note/{note}/delete/')
+        self.assertEqual(self.counts(), {(self.other_chapter.id, 'note', 'alice'): 1})
+        stats = self.stats()
+        self.assertEqual(
+            [(row['chapterId'], row['notes'], row['comments']) for row in stats['notesPerChapter']],
+            [(str(self.other_chapter.id), 1, 0)],
+        )
+        self.assertEqual(stats['topAnnotators'], [{'author': 'alice', 'notes': 1, 'comments': 0}])
+
+    def test_author_change_moves_note_count(self):
+        note = self.add_note(self.chapter, 'alice')
+        self.client.patch(f'/books/note/{note}/update/', json.dumps({'author': 'carol'}), content_type='application/json')
+        self.assertEqual(self.counts(), {(self.chapter.id, 'note', 'carol'): 1})
+        self.client.patch(f'/books/note/{note}/update/', json.dumps({'content': 'edited'}), content_type='application/json')
+        self.assertEqual(self.counts(), {(self.chapter.id, 'note', 'carol'): 1})
+
+    def test_rebuild_matches_incremental_counts(self):
+        for chapter in (self.chapter, self.other_chapter):
+            for author in ('alice', 'bob', 'alice'):
+                note = self.add_note(chapter, author)
+                self.add_comment(note, 'carol')
+                self.add_comment(note, author)
+        self.client.delete(f'/books/note/{note}/delete/')
+        self.client.patch(f'/books/note/{note - 1}/update/', json.dumps({'author': 'dave'}), content_type='application/json')
+        incremental = self.counts()
+        self.assertTrue(incremental)
+        call_command('rebuild_stats', stdout=StringIO())
+        self.assertEqual(self.counts(), incremental)
+
+    def test_cascading_delete_drops_rollups_without_per_row_work(self):
+        for _ in range(30):
+            note = self.add_note(self.chapter, 'alice')
+            self.add_comment(note, 'bob')
+            self.add_comment(note, 'carol')
+        self.add_note(self.other_chapter, 'alice')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.delete(f'/books/chapter/{self.chapter.id}/delete/').status_code, 200)
+        self.assertLess(len(queries), 20)
+        self.assertEqual(self.counts(), {(self.other_chapter.id, 'note', 'alice'): 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.delete(f'/books/{self.book.id}/delete/').status_code, 200)
+        self.assertLess(len(queries), 20)
+        self.assertFalse(ActivityRollup.objects.exists())
+
+    def test_comment_activity_buckets(self):
+        note = self.add_note(self.chapter, 'alice')
+        for day in ((3, 2), (3, 4), (3, 31), (4, 1), (4, 1)):
+            comment = self.add_comment(note, 'bob')
+            NoteComment.objects.filter(id=comment).update(timestamp=datetime(2026, *day, 12, tzinfo=dt_timezone.utc))
+        call_command('rebuild_stats', stdout=StringIO())
+        expected = {
+            'day': [('2026-03-02', 1), ('2026-03-04', 1), ('2026-03-31', 1), ('2026-04-01', 2)],
+            'week': [('2026-03-02', 2), ('2026-03-30', 3)],
+            'month': [('2026-03-01', 3), ('2026-04-01', 2)],
+        }
+        for bucket, buckets in expected.items():
+            with self.subTest(bucket=bucket):
+                activity = self.stats(f'?bucket={bucket}')['commentActivity']
+                self.assertEqual([(row['bucket'], row['comments']) for row in activity], buckets)
+        self.assertEqual(self.client.get('/books/stats/?bucket=year').status_code, 400)
+
+    def test_book_and_author_filters(self):
+        other_book = Book.objects.create(owner=self.user, title='Emma', author='Jane Austen')
+        other_book_chapter = Chapter.objects.create(book=other_book, title='One', chapter_number=1)
+        self.add_note(self.chapter, 'alice')
+        self.add_note(other_book_chapter, 'bob')
+        self.add_note(other_book_chapter, 'bob')
+
+        def chapters(stats):
+            return [(row['bookId'], row['notes']) for row in stats['notesPerChapter']]
+
+        self.assertEqual(chapters(self.stats()), [(str(self.book.id), 1), (str(other_book.id), 2)])
+        self.assertEqual(chapters(self.stats('?author=Jane%20Austen')), [(str(other_book.id), 2)])
+        self.assertEqual(chapters(self.stats(f'?book={self.book.id}')), [(str(self.book.id), 1)])
+        self.assertEqual(self.stats('?author=Nobody')['notesPerChapter'], [])
+        self.assertEqual(self.client.get('/books/stats/?book=abc').status_code, 400)
+        self.assertEqual(self.stats()['mostAnnotatedChapters'][0]['chapterId'], str(other_book_chapter.id))
@@ -5,15 +5,30 @@ from .chapter_views import add_chapter
 from .chapter_api import list_chapters
 from .note_api import add_note
 from .note_list_api import list_notes
+from .activity_api import list_activity
+from .import_api import bulk_import_books
+from .revision_api import list_note_revisions, note_revision, list_book_revisions, book_revision
+from .stats_api import book_stats
+from .auth_api import register, login_user, logout_user
 
 urlpatterns = [
+    path('auth/register/', register, name='register'),
+    path('auth/login/', login_user, name='login'),
+    path('auth/logout/', logout_user, name='logout'),
     path('add/', add_book, name='add_book'),
     path('list/', list_books, name='list_books'),
+    path('import/', bulk_import_books, name='bulk_import_books'),
+    path('stats/', book_stats, name='book_stats'),
     path('<str:book_id>/update/', update_book, name='update_book'),
     path('chapter/<str:chapter_id>/update/', update_chapter, name='update_chapter'),
     path('note/<str:note_id>/update/', update_note, name='update_note'),
+    path('<str:book_id>/revisions/', list_book_revisions, name='list_book_revisions'),
+    path('<str:book_id>/revisions/<int:number>/', book_revision, name='book_revision'),
+    path('note/<str:note_id>/revisions/', list_note_revisions, name='list_note_revisions'),
+    path('note/<str:note_id>/revisions/<int:number>/', note_revision, name='note_revision'),
     path('<str:book_id>/add-chapter/', add_chapter, name='add_chapter'),
     path('<str:book_id>/chapters/', list_chapters, name='list_chapters'),
+    path('<str:book_id>/activity/', list_activity, name='list_activity'),
     path('chapter/<str:chapter_id>/add-note/', add_note, name='add_note'),
     path('chapter/<str:chapter_id>/notes/', list_notes, name='list_notes'),
     path('<str:book_id>/delete/', delete_book, name='delete_book'),
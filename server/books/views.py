@@ -1,9 +1,17 @@
 from django.views.decorators.csrf import csrf_exempt
+from django.db import transaction
 from django.http import JsonResponse
 import json
+from .activity_api import invalidate_activity_cache
+from .revisions import record_revision
+from .stats import move_note_annotator
+from .idempotency import idempotent
+from .auth import api_login_required
 
 # PATCH CHAPTER
 @csrf_exempt
+@api_login_required
+@idempotent
 def update_chapter(request, chapter_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -13,7 +21,7 @@ def update_chapter(request, chapter_id):
         return response
     if request.method == 'PATCH':
         try:
-            chapter = Chapter.objects.get(id=chapter_id)
+            chapter = Chapter.objects.get(id=chapter_id, book__owner=request.user)
             data = json.loads(request.body)
             if 'title' in data:
                 chapter.title = data['title']
@@ -29,6 +37,8 @@ def update_chapter(request, chapter_id):
 
 # PATCH NOTE
 @csrf_exempt
+@api_login_required
+@idempotent
 def update_note(request, note_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -38,13 +48,20 @@ def update_note(request, note_id):
         return response
     if request.method == 'PATCH':
         try:
-            note = ChapterNote.objects.get(id=note_id)
             data = json.loads(request.body)
-            if 'content' in data:
-                note.content = data['content']
-            if 'author' in data:
-                note.author = data['author']
-            note.save()
+            with transaction.atomic():
+                # Lock the note so overlapping saves record revisions one at a time.
+                note = ChapterNote.objects.select_for_update(of=('self',)).select_related('chapter').get(
+                    id=note_id, chapter__book__owner=request.user,
+                )
+                if 'content' in data:
+                    record_revision(note, note.content, data['content'])
+                    note.content = data['content']
+                old_author = note.author
+                if 'author' in data:
+                    note.author = data['author']
+                note.save()
+                move_note_annotator(note, old_author)
             return JsonResponse({'id': note.id, 'content': note.content, 'author': note.author, 'timestamp': note.timestamp.isoformat()}, status=200)
         except ChapterNote.DoesNotExist:
             return JsonResponse({'error': 'Note not found'}, status=404)
@@ -56,6 +73,7 @@ from .models import Book, Chapter, ChapterNote
 # DELETE BOOK
 from django.views.decorators.csrf import csrf_exempt
 @csrf_exempt
+@api_login_required
 def delete_book(request, book_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -65,7 +83,8 @@ def delete_book(request, book_id):
         return response
     if request.method == 'DELETE':
         try:
-            book = Book.objects.get(id=book_id)
+            book = Book.objects.get(id=book_id, owner=request.user)
+            invalidate_activity_cache(book.id)
             book.delete()
             return JsonResponse({'success': True}, status=200)
         except Book.DoesNotExist:
@@ -76,6 +95,7 @@ def delete_book(request, book_id):
 
 # DELETE CHAPTER
 @csrf_exempt
+@api_login_required
 def delete_chapter(request, chapter_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -85,8 +105,9 @@ def delete_chapter(request, chapter_id):
         return response
     if request.method == 'DELETE':
         try:
-            chapter = Chapter.objects.get(id=chapter_id)
+            chapter = Chapter.objects.get(id=chapter_id, book__owner=request.user)
             chapter.delete()
+            invalidate_activity_cache(chapter.book_id)
             return JsonResponse({'success': True}, status=200)
         except Chapter.DoesNotExist:
             return JsonResponse({'error': 'Chapter not found'}, status=404)
@@ -96,6 +117,7 @@ def delete_chapter(request, chapter_id):
 
 # DELETE NOTE
 @csrf_exempt
+@api_login_required
 def delete_note(request, note_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -105,7 +127,7 @@ def delete_note(request, note_id):
         return response
     if request.method == 'DELETE':
         try:
-            note = ChapterNote.objects.get(id=note_id)
+            note = ChapterNote.objects.select_related('chapter').get(id=note_id, chapter__book__owner=request.user)
             note.delete()
             return JsonResponse({'success': True}, status=200)
         except ChapterNote.DoesNotExist:
@@ -119,6 +141,8 @@ import json
 from .models import Book
 
 @csrf_exempt
+@api_login_required
+@idempotent
 def update_book(request, book_id):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -128,15 +152,19 @@ def update_book(request, book_id):
         return response
     if request.method == 'PATCH':
         try:
-            book = Book.objects.get(id=book_id)
             data = json.loads(request.body)
-            for field in ['title', 'author', 'notes', 'coverImage']:
-                if field in data:
-                    if field == 'coverImage':
-                        setattr(book, 'cover_image', data[field])
-                    else:
-                        setattr(book, field, data[field])
-            book.save()
+            with transaction.atomic():
+                # Lock the book so overlapping saves record revisions one at a time.
+                book = Book.objects.select_for_update(of=('self',)).get(id=book_id, owner=request.user)
+                if 'notes' in data:
+                    record_revision(book, book.notes, data['notes'])
+                for field in ['title', 'author', 'notes', 'coverImage']:
+                    if field in data:
+                        if field == 'coverImage':
+                            setattr(book, 'cover_image', data[field])
+                        else:
+                            setattr(book, field, data[field])
+                book.save()
             return JsonResponse({'id': book.id, 'title': book.title, 'author': book.author, 'notes': book.notes, 'coverImage': book.cover_image}, status=200)
         except Book.DoesNotExist:
             return JsonResponse({'error': 'Book not found'}, status=404)
@@ -148,6 +176,8 @@ from django.http import JsonResponse
 import json
 from .models import Book
 @csrf_exempt
+@api_login_required
+@idempotent
 def add_book(request):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -165,6 +195,7 @@ def add_book(request):
             if not title or not author:
                 return JsonResponse({'error': 'Missing title or author'}, status=400)
             book = Book.objects.create(
+                owner=request.user,
                 title=title,
                 author=author,
                 notes=notes,
@@ -180,6 +211,7 @@ import json
 from .models import Book
 
 @csrf_exempt
+@api_login_required
 def list_books(request):
     if request.method == 'OPTIONS':
         response = JsonResponse({'detail': 'CORS preflight'})
@@ -188,7 +220,7 @@ def list_books(request):
         response["Access-Control-Allow-Headers"] = "Content-Type"
         return response
     if request.method == 'GET':
-        books = Book.objects.all()
+        books = Book.objects.filter(owner=request.user).order_by('created_at')
         data = [
             {
                 'id': str(book.id),
@@ -219,6 +251,7 @@ def list_books(request):
             if not title or not author:
                 return JsonResponse({'error': 'Missing title or author'}, status=400)
             book = Book.objects.create(
+                owner=request.user,
                 title=title,
                 author=author,
                 notes=notes,
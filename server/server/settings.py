@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -19,15 +22,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
+# Settings profile: 'development' (default) or 'production'. The production
+# profile is a lean, API-only setup for serverless deploys where cold start
+# matters: no admin, messages, static files or templates, and DEBUG off so
+# query logging is disabled.
+SETTINGS_PROFILE = os.environ.get('DJANGO_PROFILE', 'development')
+LEAN_PROFILE = SETTINGS_PROFILE == 'production'
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-^%+typ^loa92=mk=)4!0&y@agr9-zsnp@z%gifmh^nh#irm0&g'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-^%+typ^loa92=mk=)4!0&y@agr9-zsnp@z%gifmh^nh#irm0&g')
+if LEAN_PROFILE and 'DJANGO_SECRET_KEY' not in os.environ:
+    raise ImproperlyConfigured('DJANGO_SECRET_KEY must be set when DJANGO_PROFILE=production.')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = not LEAN_PROFILE
 
 ALLOWED_HOSTS = ['bellabooks-19lt.vercel.app', 'bellabooks-production.up.railway.app', '127.0.0.1', 'localhost']
 
-import os
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # Application definition
 
@@ -53,6 +64,23 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if LEAN_PROFILE:
+    # The books API only needs its own app, CORS headers and the user model;
+    # it authenticates with API tokens, not sessions.
+    INSTALLED_APPS = [
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'books',
+        'corsheaders',
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'corsheaders.middleware.CorsMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+
 ROOT_URLCONF = 'server.urls'
 
 TEMPLATES = [
@@ -71,6 +99,9 @@ TEMPLATES = [
     },
 ]
 
+if LEAN_PROFILE:
+    TEMPLATES = []
+
 WSGI_APPLICATION = 'server.wsgi.application'
 
 
@@ -88,6 +119,20 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# The activity feed caches its first page and relies on invalidation when notes
+# and comments change, so the cache has to be shared by every gunicorn worker;
+# the per-process default (LocMemCache) would serve stale pages from the others.
+# Its table is created by the books 0015_cache_table migration.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'books_cache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -131,4 +176,8 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
  
 # CORS settings
+from corsheaders.defaults import default_headers
+
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']